@@ -9,6 +9,7 @@ os.environ['QT_SCALE_FACTOR_ROUNDING_POLICY'] = 'PassThrough'
 import sys
 import fnmatch
 import ast
+import re
 import hashlib
 import hmac
 
@@ -21,6 +22,12 @@ if os.path.exists(src_dir):
 # V-001 & V-003 Fix: Secure Patch Loader with Signature Verification
 # ============================================================
 
+# 程序所在目录（打包后为可执行文件目录），.patch_key / .approved_patches 均位于此处
+_APP_DIR = os.path.dirname(sys.executable) if getattr(sys, 'frozen', False) else os.path.dirname(os.path.abspath(__file__))
+_KEY_FILE = os.path.join(_APP_DIR, '.patch_key')
+_APPROVED_FILE = os.path.join(_APP_DIR, '.approved_patches')
+
+
 # 获取签名密钥 - 优先级: 环境变量 > 内嵌密钥 > 默认密钥
 def _get_signature_key() -> bytes:
     """
@@ -33,11 +40,9 @@ def _get_signature_key() -> bytes:
         return env_key.encode('utf-8')
     
     # 2. 尝试从同目录的 .patch_key 文件读取
-    app_dir = os.path.dirname(sys.executable) if getattr(sys, 'frozen', False) else os.path.dirname(os.path.abspath(__file__))
-    key_file = os.path.join(app_dir, '.patch_key')
-    if os.path.exists(key_file):
+    if os.path.exists(_KEY_FILE):
         try:
-            with open(key_file, 'r') as f:
+            with open(_KEY_FILE, 'r') as f:
                 key = f.read().strip()
                 if key:
                     return key.encode('utf-8')
@@ -48,38 +53,33 @@ def _get_signature_key() -> bytes:
     return b'mca_default_key_for_dev_only'
 
 
-def _compute_file_signature(filepath: str, key: bytes) -> str:
-    """计算文件的 HMAC-SHA256 签名"""
+def _compute_file_signature(filepath: str, key: bytes, content: bytes | None = None) -> str:
+    """计算文件的 HMAC-SHA256 签名；已读入的 content 直接复用，否则分块流式读取"""
     try:
+        if content is not None:
+            return hmac.new(key, content, hashlib.sha256).hexdigest()
+        h = hmac.new(key, digestmod=hashlib.sha256)
         with open(filepath, 'rb') as f:
-            content = f.read()
-        signature = hmac.new(key, content, hashlib.sha256).hexdigest()
-        return signature
+            for chunk in iter(lambda: f.read(65536), b''):
+                h.update(chunk)
+        return h.hexdigest()
     except Exception:
         return ''
 
 
-def _load_approved_signatures() -> set:
+def _load_approved_signatures() -> frozenset:
     """
     加载已批准的补丁签名列表
-    从 .approved_patches 文件读取
+    从 .approved_patches 文件读取（一次性读入，忽略空行与 # 注释）
     """
-    approved = set()
-    
-    app_dir = os.path.dirname(sys.executable) if getattr(sys, 'frozen', False) else os.path.dirname(os.path.abspath(__file__))
-    approved_file = os.path.join(app_dir, '.approved_patches')
-    
-    if os.path.exists(approved_file):
-        try:
-            with open(approved_file, 'r') as f:
-                for line in f:
-                    line = line.strip()
-                    if line and not line.startswith('#'):
-                        approved.add(line)
-        except Exception:
-            pass
+    try:
+        with open(_APPROVED_FILE, 'r') as f:
+            lines = f.read().splitlines()
+    except Exception:
+        return frozenset()
     
-    return approved
+    stripped = (line.strip() for line in lines)
+    return frozenset(line for line in stripped if line and not line.startswith('#'))
 
 
 # 安全配置: 允许的补丁文件名白名单
@@ -89,6 +89,18 @@ ALLOWED_PATCH_FILES = {
     'patch_*.py',        # 通配符匹配
 }
 
+# 白名单预处理：字面文件名走集合查找，通配符合并为一个正则
+_ALLOWED_PATCH_EXACT = frozenset(
+    os.path.normcase(p) for p in ALLOWED_PATCH_FILES if not any(c in p for c in '*?[')
+)
+_ALLOWED_PATCH_GLOBS = [
+    os.path.normcase(p) for p in ALLOWED_PATCH_FILES if any(c in p for c in '*?[')
+]
+_ALLOWED_PATCH_RE = (
+    re.compile('|'.join(fnmatch.translate(p) for p in _ALLOWED_PATCH_GLOBS))
+    if _ALLOWED_PATCH_GLOBS else None
+)
+
 # 危险代码模式
 DANGEROUS_PATTERNS = [
     'eval(', 'exec(', '__import__', 'compile(',
@@ -98,16 +110,15 @@ DANGEROUS_PATTERNS = [
 ]
 
 
-def _is_safe_patch_file(filepath: str) -> bool:
-    """验证补丁文件安全性"""
+def _is_safe_patch_file(filepath: str, raw: bytes | None = None) -> bool:
+    """验证补丁文件安全性；raw 为调用方已读入的文件内容"""
     filename = os.path.basename(filepath)
     
-    # 1. 检查文件名是否在白名单
-    allowed = False
-    for pattern in ALLOWED_PATCH_FILES:
-        if fnmatch.fnmatch(filename, pattern):
-            allowed = True
-            break
+    # 1. 检查文件名是否在白名单（与 fnmatch.fnmatch 一致，先按平台规则 normcase）
+    name = os.path.normcase(filename)
+    allowed = name in _ALLOWED_PATCH_EXACT or (
+        _ALLOWED_PATCH_RE is not None and _ALLOWED_PATCH_RE.match(name) is not None
+    )
     
     if not allowed:
         print(f"[Security] 拒绝加载未授权的补丁文件: {filename}")
@@ -115,8 +126,10 @@ def _is_safe_patch_file(filepath: str) -> bool:
     
     # 2. 检查文件内容是否有危险代码
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
+        if raw is None:
+            with open(filepath, 'rb') as f:
+                raw = f.read()
+        content = raw.decode('utf-8')
             
         # AST 解析检查
         try:
@@ -138,13 +151,12 @@ def _is_safe_patch_file(filepath: str) -> bool:
     return True
 
 
-def _verify_patch_signature(filepath: str) -> bool:
+def _verify_patch_signature(filepath: str, key: bytes, approved: frozenset, raw: bytes | None = None) -> bool:
     """
     验证补丁文件签名
-    只有签名匹配的补丁才会被加载
+    只有签名匹配的补丁才会被加载；key 与 approved 由调用方在整个目录扫描中只加载一次
     """
-    signature = _compute_file_signature(filepath, _get_signature_key())
-    approved = _load_approved_signatures()
+    signature = _compute_file_signature(filepath, key, raw)
     
     if signature in approved:
         return True
@@ -160,32 +172,44 @@ def _load_patches_safely(patch_dir: str):
     
     loaded_count = 0
     rejected_count = 0
+    key = None
+    approved = None
     
-    for filename in os.listdir(patch_dir):
-        if not filename.endswith('.py'):
-            continue
-        
-        filepath = os.path.join(patch_dir, filename)
-        if not os.path.isfile(filepath):
+    # scandir 的目录项自带文件类型，is_file() 对普通文件无需再 stat
+    with os.scandir(patch_dir) as entries:
+        candidates = [
+            (entry.name, entry.path)
+            for entry in entries
+            if entry.name.endswith('.py') and entry.is_file()
+        ]
+    
+    for filename, filepath in candidates:
+        # 只读一次文件：安全检查与签名校验使用同一份字节
+        try:
+            with open(filepath, 'rb') as f:
+                raw = f.read()
+        except OSError as e:
+            print(f"[Security] 验证补丁文件失败: {filename} - {e}")
             continue
         
         # 安全验证
-        if _is_safe_patch_file(filepath):
-            # 签名验证
-            if not _verify_patch_signature(filepath):
+        if _is_safe_patch_file(filepath, raw):
+            # 签名验证（密钥与批准列表在首个候选补丁时加载一次）
+            if key is None:
+                key = _get_signature_key()
+                approved = _load_approved_signatures()
+            if not _verify_patch_signature(filepath, key, approved, raw):
                 print(f"[Security] 补丁 {filename} 签名验证失败，已拒绝")
                 rejected_count += 1
                 continue
-                
-            try:
-                sys.path.insert(0, patch_dir)
-                print(f"[Hotfix] 已安全加载补丁: {filename}")
-                loaded_count += 1
-            except Exception as e:
-                print(f"[Security] 加载补丁失败: {filename} - {e}")
-                rejected_count += 1
+            
+            print(f"[Hotfix] 已安全加载补丁: {filename}")
+            loaded_count += 1
     
     if loaded_count > 0:
+        # 补丁目录只需加入 sys.path 一次
+        if patch_dir not in sys.path:
+            sys.path.insert(0, patch_dir)
         print(f"[Hotfix] 共加载 {loaded_count} 个已签名补丁")
     
     if rejected_count > 0:
@@ -279,7 +303,7 @@ def _validate_lib_directory(lib_dir: str) -> bool:
 # 补丁必须经过签名验证才能加载
 if getattr(sys, 'frozen', False):
     # Frozen runtime (打包环境)
-    application_path = os.path.dirname(sys.executable)
+    application_path = _APP_DIR
     
     # Patches (安全加载 - 需要签名)
     patch_dir = os.path.join(application_path, "patches")
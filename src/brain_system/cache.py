@@ -4,11 +4,16 @@
 """
 from __future__ import annotations
 
+import heapq
+import json
+import logging
 import sys
-import time
-from collections import OrderedDict
-from dataclasses import dataclass
-from typing import Any
+import threading
+from time import monotonic as _now
+from collections.abc import Iterable, Mapping
+from typing import IO, Any
+
+from .utils.json_codec import dumps as _json_dumps
 
 _SIZE_ESTIMATE_CACHE: dict[int, int] = {}
 _SIZE_CACHE_MAX = 1000
@@ -75,27 +80,84 @@ def _estimate_size(obj: Any) -> int:
             result = 1024
     
     if len(_SIZE_ESTIMATE_CACHE) >= _SIZE_CACHE_MAX:
-        _SIZE_ESTIMATE_CACHE.pop(next(iter(_SIZE_ESTIMATE_CACHE)))
+        _SIZE_ESTIMATE_CACHE.pop(next(iter(_SIZE_ESTIMATE_CACHE)), None)
     _SIZE_ESTIMATE_CACHE[obj_id] = result
     
     return result
 
 
-@dataclass(slots=True)
-class CacheItem:
-    """缓存项：存储值和过期时间。
+# get 内部用于区分“未命中”与“缓存值为 None”
+_MISSING = object()
+
+# 无需 json.dumps 探测即可确定可序列化的标量类型
+_JSON_SAFE = (str, int, float, bool, type(None))
+
+
+def _is_shallow_json(obj: list | tuple | dict) -> bool:
+    """判断容器是否只包含 JSON 标量（仅检查一层）。"""
+    if isinstance(obj, dict):
+        return all(
+            isinstance(k, _JSON_SAFE) and isinstance(v, _JSON_SAFE) for k, v in obj.items()
+        )
+    return all(isinstance(v, _JSON_SAFE) for v in obj)
+
+
+def _is_json_serializable(value: Any) -> bool:
+    """值能否被标准库 json 序列化；常见的标量/浅层容器直接放行，只有未知类型才做 JSON 探测。"""
+    if isinstance(value, _JSON_SAFE) or (
+        isinstance(value, (list, tuple, dict)) and _is_shallow_json(value)
+    ):
+        return True
+    try:
+        json.dumps(value)
+    except Exception:
+        return False
+    return True
+
+
+def _filter_serializable(live: Iterable[tuple[str, Any]]) -> dict[str, Any]:
+    """把 (key, value) 收集为字典，跳过不可 JSON 序列化的值。"""
+    return {key: value for key, value in live if _is_json_serializable(value)}
 
-    Attributes:
-        value: 缓存的值。
-        expires_at: 过期时间戳（秒）。
-        size_bytes: 估算的字节大小。
-        access_count: 访问次数（用于动态 TTL）。
-    """
 
-    value: Any
-    expires_at: float
-    size_bytes: int = 0
-    access_count: int = 0
+def _dump_json_items(live: Iterable[tuple[str, Any]], fp: IO[bytes]) -> int:
+    """把 (key, value) 逐条写成一个 JSON 对象，跳过不可序列化的值（记录 debug 日志）。
+
+    条目取舍与 _filter_serializable 相同：标准库 json 拒绝的值（dataclass、datetime、
+    UUID、Enum 等）一律跳过，不会以有损形式写入后在重启时变成 dict/str/int 命中。
+    NaN/Infinity 与超出 64 位的整数按标准库规则原样写出，见 utils.json_codec.dumps。
+
+    Returns:
+        写入的条目数。
+    """
+    dumps = _json_dumps
+    write = fp.write
+    write(b"{")
+    written = 0
+    for key, value in live:
+        # 通过判定的值标准库可编码，dumps 不会再抛错
+        if not _is_json_serializable(value):
+            logging.debug("缓存条目不可 JSON 序列化，未写入快照: %s", key)
+            continue
+        write((b"," if written else b"") + dumps(key) + b":" + dumps(value))
+        written += 1
+    write(b"}")
+    return written
+
+
+def _hotness(entry: tuple[int, float, str, Any]) -> tuple[int, float]:
+    """_top_items 的排序键：(access_count, expires_at)，避免比较到值本身。"""
+    return entry[0], entry[1]
+
+
+# 缓存项：(expires_at, value, size_bytes, access_count, referenced)
+# - expires_at: 过期时间（time.monotonic 秒）
+# - value: 缓存的值
+# - size_bytes: 估算的字节大小
+# - access_count: 访问次数（用于动态 TTL）
+# - referenced: 上次驱逐扫描后是否被命中（CLOCK 二次机会标记）
+# 使用元组而非对象：分配更小，单条字节码即可解包。
+_Entry = tuple[float, Any, int, int, bool]
 
 
 class LruTtlCache:
@@ -106,8 +168,10 @@ class LruTtlCache:
     - max_bytes: 最大字节数（可选）
     - ttl_seconds: 每个条目的存活时间
     - dynamic_ttl: 根据访问频率动态调整 TTL
-    - get() 会刷新 LRU 顺序
-    - 过期条目会在访问/写入时惰性清理
+    - 近似 LRU（CLOCK 二次机会）：get() 命中只原地标记，不移动条目；
+      驱逐时跳过被标记的队首条目并将其移到队尾
+    - 过期条目会在访问/写入时惰性清理（按过期时间的小顶堆，O(k log n)）
+    - 线程安全：公开方法由单个锁保护；以下划线开头的内部方法假定调用方已持锁
 
     Attributes:
         hits: 缓存命中次数。
@@ -125,6 +189,7 @@ class LruTtlCache:
         max_bytes: int | None = None,
         dynamic_ttl: bool = True,
         dynamic_ttl_multiplier: float = 2.0,
+        intern_keys: bool = False,
     ) -> None:
         """初始化缓存。
 
@@ -134,6 +199,7 @@ class LruTtlCache:
             max_bytes: 最大字节数（可选），None 表示不限制。
             dynamic_ttl: 是否启用动态 TTL（根据访问频率调整）。
             dynamic_ttl_multiplier: 动态 TTL 最大倍数。
+            intern_keys: 写入时对键调用 sys.intern（键集合小且重复时节省内存）。
 
         Raises:
             ValueError: 参数不合法。
@@ -143,14 +209,17 @@ class LruTtlCache:
         if ttl_seconds <= 0:
             raise ValueError("ttl_seconds must be > 0")
 
+        self._intern_keys: bool = intern_keys
         self._max_entries: int = int(max_entries)
         self._ttl_seconds: float = float(ttl_seconds)
         self._max_bytes: int | None = max_bytes
         self._dynamic_ttl: bool = dynamic_ttl
         self._dynamic_ttl_multiplier: float = dynamic_ttl_multiplier
-        self._items: OrderedDict[str, CacheItem] = OrderedDict()
+        self._items: dict[str, _Entry] = {}
+        # (expires_at, key) 小顶堆；允许存在陈旧项，弹出时再与 _items 校验
+        self._exp_heap: list[tuple[float, str]] = []
         self._current_bytes: int = 0
-        self._write_ops: int = 0
+        self._lock = threading.Lock()
 
         self.hits: int = 0
         self.misses: int = 0
@@ -198,77 +267,77 @@ class LruTtlCache:
         Raises:
             ValueError: 参数不合法。
         """
-        if max_entries is not None:
-            if max_entries <= 0:
-                raise ValueError("max_entries must be > 0")
-            self._max_entries = int(max_entries)
-        if ttl_seconds is not None:
-            if ttl_seconds <= 0:
-                raise ValueError("ttl_seconds must be > 0")
-            self._ttl_seconds = float(ttl_seconds)
-        if max_bytes is not None:
-            self._max_bytes = max_bytes if max_bytes > 0 else None
+        if max_entries is not None and max_entries <= 0:
+            raise ValueError("max_entries must be > 0")
+        if ttl_seconds is not None and ttl_seconds <= 0:
+            raise ValueError("ttl_seconds must be > 0")
 
-        self._evict_if_needed()
+        with self._lock:
+            if max_entries is not None:
+                self._max_entries = int(max_entries)
+            if ttl_seconds is not None:
+                self._ttl_seconds = float(ttl_seconds)
+            if max_bytes is not None:
+                self._max_bytes = max_bytes if max_bytes > 0 else None
 
-    def _now(self) -> float:
-        """获取当前时间戳。"""
-        return time.time()
+            self._evict_if_needed()
 
-    def _is_expired(self, item: CacheItem, now: float) -> bool:
-        """检查条目是否过期。"""
-        return item.expires_at <= now
+    def _purge_expired(self) -> None:
+        """按过期时间弹出堆顶的已过期条目，只触达 k 个过期项。"""
+        heap = self._exp_heap
+        if not heap:
+            return
+        now = _now()
+        items = self._items
+        heappop = heapq.heappop
+        while heap and heap[0][0] <= now:
+            exp, key = heappop(heap)
+            item = items.get(key)
+            if item is None:
+                continue
+            if item[0] == exp:
+                items.pop(key)
+                self._current_bytes -= item[2]
+                self.expired += 1
+            elif item[0] > exp:
+                # 过期时间已被延长（动态 TTL / refresh_ttl），按新时间重新入堆
+                heapq.heappush(heap, (item[0], key))
 
-    def _purge_expired_front(self) -> None:
-        """从最旧一侧清理过期条目。"""
-        now = self._now()
-        keys_to_delete: list[str] = []
-        for key, item in self._items.items():
-            if self._is_expired(item, now):
-                keys_to_delete.append(key)
-                self._current_bytes -= item.size_bytes
-            else:
-                break
-        for key in keys_to_delete:
-            self._items.pop(key, None)
-            self.expired += 1
+        # 删除/覆盖/LRU 驱逐会留下陈旧堆项，过多时整体重建
+        if len(heap) > 2 * len(items) + 64:
+            self._exp_heap = [(item[0], k) for k, item in items.items()]
+            heapq.heapify(self._exp_heap)
 
     def _evict_if_needed(self) -> None:
         """在需要时驱逐条目。"""
-        self._purge_expired_front()
-
-        # 定期执行小预算全表过期清理，避免仅清理队首导致的过期项滞留。
-        if self._write_ops and (self._write_ops & 63) == 0:
-            self._purge_expired_sample(budget=64)
+        self._purge_expired()
 
         # 按条目数驱逐
-        while len(self._items) > self._max_entries:
-            key, item = self._items.popitem(last=False)
-            self._current_bytes -= item.size_bytes
-            self.evictions += 1
+        items = self._items
+        while len(items) > self._max_entries:
+            self._evict_one()
 
         # 按字节数驱逐
         if self._max_bytes is not None:
-            while self._current_bytes > self._max_bytes and self._items:
-                key, item = self._items.popitem(last=False)
-                self._current_bytes -= item.size_bytes
-                self.evictions += 1
-
-    def _purge_expired_sample(self, budget: int = 64) -> None:
-        """有限预算扫描过期条目。"""
-        if not self._items or budget <= 0:
-            return
+            while self._current_bytes > self._max_bytes and items:
+                self._evict_one()
 
-        now = self._now()
-        removed = 0
-        for key, item in list(self._items.items()):
-            if self._is_expired(item, now):
-                self._items.pop(key, None)
-                self._current_bytes -= item.size_bytes
-                self.expired += 1
-                removed += 1
-                if removed >= budget:
-                    break
+    def _evict_one(self) -> None:
+        """驱逐一个条目（CLOCK 二次机会）。
+
+        dict 保持插入顺序，队首即最早写入/轮转的条目；被命中过的队首条目
+        清除标记后移到队尾，直到遇到未被标记的条目。最坏情况轮转一整圈。
+        """
+        items = self._items
+        while True:
+            key = next(iter(items))
+            item = items.pop(key)
+            if item[4]:
+                items[key] = (item[0], item[1], item[2], item[3], False)
+                continue
+            self._current_bytes -= item[2]
+            self.evictions += 1
+            return
 
     def get(self, key: str) -> Any:
         """获取缓存值，支持动态 TTL。
@@ -279,27 +348,84 @@ class LruTtlCache:
         Returns:
             缓存值，若不存在或已过期则返回 None。
         """
-        now = self._now()
-        item = self._items.get(key)
+        # 热路径：逻辑与 _get_locked 相同，内联以省去一次方法调用
+        with self._lock:
+            items = self._items
+            item = items.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            now = _now()
+            expires_at, value, size_bytes, access_count, referenced = item
+            if expires_at <= now:
+                del items[key]
+                self._current_bytes -= size_bytes
+                self.expired += 1
+                self.misses += 1
+                return None
+            if self._dynamic_ttl:
+                access_count += 1
+                ttl_boost = min(access_count / 10.0, self._dynamic_ttl_multiplier - 1.0)
+                new_expires_at = now + (self._ttl_seconds * (1.0 + ttl_boost))
+                if new_expires_at < expires_at:
+                    heapq.heappush(self._exp_heap, (new_expires_at, key))
+                items[key] = (new_expires_at, value, size_bytes, access_count, True)
+            elif not referenced:
+                # 原地覆盖不改变顺序；已标记的条目命中时无需任何写入
+                items[key] = (expires_at, value, size_bytes, access_count, True)
+            self.hits += 1
+            return value
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        """批量获取缓存值，只加一次锁。
+
+        Args:
+            keys: 缓存键序列。
+
+        Returns:
+            命中的键值字典；未命中或已过期的键不出现在结果中。
+        """
+        out: dict[str, Any] = {}
+        with self._lock:
+            now = _now()
+            get_locked = self._get_locked
+            for key in keys:
+                value = get_locked(key, now)
+                if value is not _MISSING:
+                    out[key] = value
+        return out
+
+    def _get_locked(self, key: str, now: float) -> Any:
+        """查找并刷新单个条目（调用方须持锁），未命中返回 _MISSING。
+
+        供批量接口使用；get() 内联了同样的逻辑，修改时需保持两者一致。
+        """
+        items = self._items
+        item = items.get(key)
         if item is None:
             self.misses += 1
-            return None
-        if self._is_expired(item, now):
-            self._items.pop(key, None)
-            self._current_bytes -= item.size_bytes
+            return _MISSING
+        expires_at, value, size_bytes, access_count, referenced = item
+        if expires_at <= now:
+            del items[key]
+            self._current_bytes -= size_bytes
             self.expired += 1
             self.misses += 1
-            return None
+            return _MISSING
 
         # 动态 TTL：增加访问计数
         if self._dynamic_ttl:
-            item.access_count += 1
-            ttl_boost = min(item.access_count / 10.0, self._dynamic_ttl_multiplier - 1.0)
-            item.expires_at = now + (self._ttl_seconds * (1.0 + ttl_boost))
+            access_count += 1
+            ttl_boost = min(access_count / 10.0, self._dynamic_ttl_multiplier - 1.0)
+            new_expires_at = now + (self._ttl_seconds * (1.0 + ttl_boost))
+            if new_expires_at < expires_at:
+                heapq.heappush(self._exp_heap, (new_expires_at, key))
+            items[key] = (new_expires_at, value, size_bytes, access_count, True)
+        elif not referenced:
+            items[key] = (expires_at, value, size_bytes, access_count, True)
 
-        self._items.move_to_end(key, last=True)
         self.hits += 1
-        return item.value
+        return value
 
     def set(self, key: str, value: Any, ttl: float | None = None) -> None:
         """设置缓存值，支持动态 TTL。
@@ -309,26 +435,54 @@ class LruTtlCache:
             value: 缓存值。
             ttl: 可选的自定义 TTL（秒），None 使用默认值。
         """
-        # 如果键已存在，先减去旧值的大小
-        if key in self._items:
-            old_item = self._items[key]
-            self._current_bytes -= old_item.size_bytes
-
-        # 估算新值大小
+        if self._intern_keys:
+            key = sys.intern(key)
+        # 估算新值大小（在锁外完成，缩短临界区）
         size_bytes = _estimate_size(value)
-        
-        # 计算过期时间
-        base_ttl = ttl if ttl is not None else self._ttl_seconds
-        expires_at = self._now() + base_ttl
 
-        self._items[key] = CacheItem(
-            value=value, expires_at=expires_at, size_bytes=size_bytes, access_count=0
-        )
-        self._current_bytes += size_bytes
-        self._items.move_to_end(key, last=True)
-        self._write_ops += 1
-        self._evict_if_needed()
+        with self._lock:
+            # 如果键已存在，先移除旧值（重新插入即移到末尾）并减去其大小
+            old_item = self._items.pop(key, None)
+            if old_item is not None:
+                self._current_bytes -= old_item[2]
+
+            # 计算过期时间
+            base_ttl = ttl if ttl is not None else self._ttl_seconds
+            expires_at = _now() + base_ttl
+
+            self._items[key] = (expires_at, value, size_bytes, 0, False)
+            heapq.heappush(self._exp_heap, (expires_at, key))
+            self._current_bytes += size_bytes
+            self._evict_if_needed()
     
+    def set_many(self, values: Mapping[str, Any], ttl: float | None = None) -> None:
+        """批量设置缓存值：一次加锁、一次 update、一次驱逐。
+
+        Args:
+            values: 键值映射。
+            ttl: 可选的自定义 TTL（秒），None 使用默认值。
+        """
+        if not values:
+            return
+        maybe_intern = sys.intern if self._intern_keys else str
+        sized = [(maybe_intern(key), value, _estimate_size(value)) for key, value in values.items()]
+
+        with self._lock:
+            items = self._items
+            expires_at = _now() + (ttl if ttl is not None else self._ttl_seconds)
+            entries: dict[str, _Entry] = {}
+            for key, value, size_bytes in sized:
+                old_item = items.pop(key, None)
+                if old_item is not None:
+                    self._current_bytes -= old_item[2]
+                entries[key] = (expires_at, value, size_bytes, 0, False)
+            items.update(entries)
+            self._current_bytes += sum(e[2] for e in entries.values())
+            heap = self._exp_heap
+            for key in entries:
+                heapq.heappush(heap, (expires_at, key))
+            self._evict_if_needed()
+
     def refresh_ttl(self, key: str) -> bool:
         """刷新条目的 TTL。
 
@@ -338,19 +492,25 @@ class LruTtlCache:
         Returns:
             是否成功刷新（条目存在且未过期）。
         """
-        now = self._now()
-        item = self._items.get(key)
-        if item is None or self._is_expired(item, now):
-            return False
-        
-        # 动态 TTL：根据访问频率延长过期时间
-        if self._dynamic_ttl:
-            multiplier = 1.0 + min(item.access_count / 10.0, self._dynamic_ttl_multiplier - 1.0)
-            item.expires_at = now + (self._ttl_seconds * multiplier)
-        else:
-            item.expires_at = now + self._ttl_seconds
-        
-        return True
+        with self._lock:
+            now = _now()
+            item = self._items.get(key)
+            if item is None or item[0] <= now:
+                return False
+            _, value, size_bytes, access_count, referenced = item
+
+            # 动态 TTL：根据访问频率延长过期时间
+            if self._dynamic_ttl:
+                multiplier = 1.0 + min(access_count / 10.0, self._dynamic_ttl_multiplier - 1.0)
+                expires_at = now + (self._ttl_seconds * multiplier)
+            else:
+                expires_at = now + self._ttl_seconds
+
+            if expires_at < item[0]:
+                # TTL 被调小时堆项会晚于实际过期时间，需补一条
+                heapq.heappush(self._exp_heap, (expires_at, key))
+            self._items[key] = (expires_at, value, size_bytes, access_count, referenced)
+            return True
 
     def delete(self, key: str) -> None:
         """删除缓存条目。
@@ -358,33 +518,71 @@ class LruTtlCache:
         Args:
             key: 缓存键。
         """
-        item = self._items.pop(key, None)
-        if item is not None:
-            self._current_bytes -= item.size_bytes
+        with self._lock:
+            item = self._items.pop(key, None)
+            if item is not None:
+                self._current_bytes -= item[2]
 
     def clear(self) -> None:
         """清空缓存。"""
-        self._items.clear()
-        self._current_bytes = 0
+        with self._lock:
+            self._items.clear()
+            self._exp_heap.clear()
+            self._current_bytes = 0
 
-    def snapshot_serializable(self) -> dict[str, Any]:
+    def snapshot_serializable(self, limit: int | None = None) -> dict[str, Any]:
         """返回可 JSON 序列化的快照。
 
         跳过不可序列化的条目。
+
+        Args:
+            limit: 只保留最热的 limit 条（见 _live_items），None 表示全部。
         """
-        import json
+        # 锁内只复制引用，JSON 探测在锁外进行
+        return _filter_serializable(self._live_items(limit))
 
-        now = self._now()
-        out: dict[str, Any] = {}
-        for key, item in list(self._items.items()):
-            if self._is_expired(item, now):
-                continue
-            try:
-                json.dumps(item.value)
-            except Exception:
-                continue
-            out[key] = item.value
-        return out
+    def dump_json(self, fp: IO[bytes], limit: int | None = None) -> int:
+        """把未过期条目以 JSON 对象流式写入二进制文件对象。
+
+        写出的条目与 snapshot_serializable 相同，值按标准库 json 的语义编码
+        （含 NaN/Infinity 与大整数），但不构建中间字典，大缓存落盘时峰值内存约减半。
+        不可序列化的条目会被跳过并记录 debug 日志。
+
+        Args:
+            fp: 以二进制模式打开的可写对象。
+            limit: 只写出最热的 limit 条（见 _live_items），None 表示全部。
+
+        Returns:
+            写入的条目数。
+        """
+        return _dump_json_items(self._live_items(limit), fp)
+
+    def _live_items(self, limit: int | None = None) -> list[tuple[str, Any]]:
+        """在锁内复制未过期条目的 (key, value) 引用。
+
+        limit 不为 None 且条目更多时，只保留最热的 limit 条，由冷到热排列，
+        重新加载时最热的条目位于队尾、最后被驱逐。
+        """
+        if limit is None:
+            with self._lock:
+                now = _now()
+                return [(key, item[1]) for key, item in self._items.items() if item[0] > now]
+        return [(key, value) for _, _, key, value in self._top_items(limit)]
+
+    def _top_items(self, limit: int) -> list[tuple[int, float, str, Any]]:
+        """返回最热的 limit 个未过期条目 (access_count, expires_at, key, value)，由冷到热。
+
+        热度按访问次数排序，次数相同时过期时间晚（最近写入或命中）者优先。
+        """
+        with self._lock:
+            now = _now()
+            top = heapq.nlargest(
+                limit,
+                ((item[3], item[0], key, item[1]) for key, item in self._items.items() if item[0] > now),
+                key=_hotness,
+            )
+        top.reverse()
+        return top
 
     def load_serializable(self, data: dict[str, Any]) -> None:
         """从快照加载缓存数据。
@@ -392,14 +590,24 @@ class LruTtlCache:
         Args:
             data: 快照数据字典。
         """
-        now = self._now()
-        for k, v in data.items():
-            size_bytes = _estimate_size(v)
-            self._items[str(k)] = CacheItem(
-                value=v, expires_at=now + self._ttl_seconds, size_bytes=size_bytes
-            )
-            self._current_bytes += size_bytes
-        self._evict_if_needed()
+        expires_at = _now() + self._ttl_seconds
+        to_key = (lambda k: sys.intern(str(k))) if self._intern_keys else str
+        entries: dict[str, _Entry] = {
+            to_key(k): (expires_at, v, _estimate_size(v), 0, False) for k, v in data.items()
+        }
+        if not entries:
+            return
+
+        with self._lock:
+            items = self._items
+            # 已存在的键先移除，既扣减旧大小，也让重载的键排到队尾
+            for key in entries.keys() & items.keys():
+                self._current_bytes -= items.pop(key)[2]
+            items.update(entries)
+            self._current_bytes += sum(e[2] for e in entries.values())
+            self._exp_heap.extend((expires_at, key) for key in entries)
+            heapq.heapify(self._exp_heap)
+            self._evict_if_needed()
 
     def get_stats(self) -> dict[str, Any]:
         """获取缓存统计信息。
@@ -407,14 +615,253 @@ class LruTtlCache:
         Returns:
             包含各项统计指标的字典。
         """
+        with self._lock:
+            return {
+                "entries": len(self._items),
+                "max_entries": self._max_entries,
+                "current_bytes": self._current_bytes,
+                "max_bytes": self._max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expired": self.expired,
+                "hit_rate": self.hits / (self.hits + self.misses) if (self.hits + self.misses) > 0 else 0.0,
+            }
+
+
+class ShardedLruTtlCache:
+    """按键哈希分片的 LruTtlCache，降低多线程下的锁竞争。
+
+    与 LruTtlCache 接口一致；每个分片拥有独立的存储与锁，
+    分片数向上取整为 2 的幂，定位分片只需一次按位与。
+    LRU/TTL/容量约束按分片独立生效：每个分片上限为 ceil(总量 / 分片数)（至少为 1），
+    因此总容量只是近似值。键在分片间分布不均时，某个分片可能在总条目数未达上限前
+    就开始淘汰；总量小于分片数时实际可容纳的条目数会超过配置值。
+    分片数应远小于 max_entries（BrainCore 按每分片至少 64 条收紧分片数）。
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int,
+        ttl_seconds: float,
+        max_bytes: int | None = None,
+        dynamic_ttl: bool = True,
+        dynamic_ttl_multiplier: float = 2.0,
+        intern_keys: bool = False,
+        shards: int = 16,
+    ) -> None:
+        """初始化分片缓存。
+
+        Args:
+            max_entries: 总最大条目数，必须大于 0。
+            ttl_seconds: 条目存活时间（秒），必须大于 0。
+            max_bytes: 总最大字节数（可选），None 表示不限制。
+            dynamic_ttl: 是否启用动态 TTL。
+            dynamic_ttl_multiplier: 动态 TTL 最大倍数。
+            intern_keys: 写入时对键调用 sys.intern。
+            shards: 分片数，会向上取整为 2 的幂。
+
+        Raises:
+            ValueError: 参数不合法。
+        """
+        if max_entries <= 0:
+            raise ValueError("max_entries must be > 0")
+        if ttl_seconds <= 0:
+            raise ValueError("ttl_seconds must be > 0")
+        if shards <= 0:
+            raise ValueError("shards must be > 0")
+
+        n = 1 << (int(shards) - 1).bit_length()
+        self._mask: int = n - 1
+        self._max_entries: int = int(max_entries)
+        self._max_bytes: int | None = max_bytes
+        self._shards: list[LruTtlCache] = [
+            LruTtlCache(
+                max_entries=self._per_shard(self._max_entries, n),
+                ttl_seconds=ttl_seconds,
+                max_bytes=self._per_shard(max_bytes, n) if max_bytes else None,
+                dynamic_ttl=dynamic_ttl,
+                dynamic_ttl_multiplier=dynamic_ttl_multiplier,
+                intern_keys=intern_keys,
+            )
+            for _ in range(n)
+        ]
+
+    @staticmethod
+    def _per_shard(total: int, n: int) -> int:
+        """单个分片的上限：总量除以 n 向上取整，至少为 1。"""
+        return max(1, -(-int(total) // n))
+
+    def _shard(self, key: str) -> LruTtlCache:
+        return self._shards[hash(key) & self._mask]
+
+    @property
+    def shard_count(self) -> int:
+        """获取分片数。"""
+        return len(self._shards)
+
+    @property
+    def max_entries(self) -> int:
+        """获取总最大条目数。"""
+        return self._max_entries
+
+    @property
+    def ttl_seconds(self) -> float:
+        """获取条目存活时间。"""
+        return self._shards[0].ttl_seconds
+
+    @property
+    def max_bytes(self) -> int | None:
+        """获取总最大字节数。"""
+        return self._max_bytes
+
+    @property
+    def current_bytes(self) -> int:
+        """获取当前总字节数。"""
+        return sum(s.current_bytes for s in self._shards)
+
+    @property
+    def hits(self) -> int:
+        return sum(s.hits for s in self._shards)
+
+    @property
+    def misses(self) -> int:
+        return sum(s.misses for s in self._shards)
+
+    @property
+    def evictions(self) -> int:
+        return sum(s.evictions for s in self._shards)
+
+    @property
+    def expired(self) -> int:
+        return sum(s.expired for s in self._shards)
+
+    def __len__(self) -> int:
+        """返回当前总条目数。"""
+        return sum(len(s) for s in self._shards)
+
+    def set_limits(
+        self,
+        *,
+        max_entries: int | None = None,
+        ttl_seconds: float | None = None,
+        max_bytes: int | None = None,
+    ) -> None:
+        """动态调整缓存限制（按分片均分）。
+
+        Raises:
+            ValueError: 参数不合法。
+        """
+        if max_entries is not None and max_entries <= 0:
+            raise ValueError("max_entries must be > 0")
+        if ttl_seconds is not None and ttl_seconds <= 0:
+            raise ValueError("ttl_seconds must be > 0")
+
+        n = len(self._shards)
+        shard_entries: int | None = None
+        shard_bytes: int | None = None
+        if max_entries is not None:
+            self._max_entries = int(max_entries)
+            shard_entries = self._per_shard(max_entries, n)
+        if max_bytes is not None:
+            self._max_bytes = max_bytes if max_bytes > 0 else None
+            # 0 会让分片取消字节上限
+            shard_bytes = self._per_shard(max_bytes, n) if max_bytes > 0 else 0
+        for s in self._shards:
+            s.set_limits(max_entries=shard_entries, ttl_seconds=ttl_seconds, max_bytes=shard_bytes)
+
+    def get(self, key: str) -> Any:
+        """获取缓存值；不存在或已过期返回 None。"""
+        return self._shard(key).get(key)
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        """批量获取：按分片分组，每个分片只加一次锁。"""
+        buckets: dict[int, list[str]] = {}
+        mask = self._mask
+        for key in keys:
+            buckets.setdefault(hash(key) & mask, []).append(key)
+        out: dict[str, Any] = {}
+        for idx, shard_keys in buckets.items():
+            out.update(self._shards[idx].get_many(shard_keys))
+        return out
+
+    def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        """设置缓存值。"""
+        self._shard(key).set(key, value, ttl)
+
+    def set_many(self, values: Mapping[str, Any], ttl: float | None = None) -> None:
+        """批量设置：按分片分组，每个分片只加一次锁。"""
+        buckets: dict[int, dict[str, Any]] = {}
+        mask = self._mask
+        for key, value in values.items():
+            buckets.setdefault(hash(key) & mask, {})[key] = value
+        for idx, bucket in buckets.items():
+            self._shards[idx].set_many(bucket, ttl)
+
+    def refresh_ttl(self, key: str) -> bool:
+        """刷新条目的 TTL。"""
+        return self._shard(key).refresh_ttl(key)
+
+    def delete(self, key: str) -> None:
+        """删除缓存条目。"""
+        self._shard(key).delete(key)
+
+    def clear(self) -> None:
+        """清空所有分片。"""
+        for s in self._shards:
+            s.clear()
+
+    def snapshot_serializable(self, limit: int | None = None) -> dict[str, Any]:
+        """合并各分片的可 JSON 序列化快照；limit 为全局最热条目数。"""
+        if limit is not None:
+            return _filter_serializable(self._top_live_items(limit))
+        out: dict[str, Any] = {}
+        for s in self._shards:
+            out.update(s.snapshot_serializable())
+        return out
+
+    def dump_json(self, fp: IO[bytes], limit: int | None = None) -> int:
+        """把所有分片的未过期条目流式写成一个 JSON 对象；limit 为全局最热条目数。"""
+        if limit is not None:
+            return _dump_json_items(self._top_live_items(limit), fp)
+        return _dump_json_items(
+            (kv for s in self._shards for kv in s._live_items()), fp
+        )
+
+    def _top_live_items(self, limit: int) -> list[tuple[str, Any]]:
+        """合并各分片的最热条目，取全局最热的 limit 条，由冷到热。"""
+        top = heapq.nlargest(
+            limit, (e for s in self._shards for e in s._top_items(limit)), key=_hotness
+        )
+        top.reverse()
+        return [(key, value) for _, _, key, value in top]
+
+    def load_serializable(self, data: dict[str, Any]) -> None:
+        """按键分发快照数据到各分片。"""
+        buckets: list[dict[str, Any]] = [{} for _ in self._shards]
+        mask = self._mask
+        for k, v in data.items():
+            key = str(k)
+            buckets[hash(key) & mask][key] = v
+        for s, bucket in zip(self._shards, buckets):
+            if bucket:
+                s.load_serializable(bucket)
+
+    def get_stats(self) -> dict[str, Any]:
+        """获取汇总后的缓存统计信息。"""
+        per_shard = [s.get_stats() for s in self._shards]
+        hits = sum(st["hits"] for st in per_shard)
+        misses = sum(st["misses"] for st in per_shard)
         return {
-            "entries": len(self._items),
+            "entries": sum(st["entries"] for st in per_shard),
             "max_entries": self._max_entries,
-            "current_bytes": self._current_bytes,
+            "current_bytes": sum(st["current_bytes"] for st in per_shard),
             "max_bytes": self._max_bytes,
-            "hits": self.hits,
-            "misses": self.misses,
-            "evictions": self.evictions,
-            "expired": self.expired,
-            "hit_rate": self.hits / (self.hits + self.misses) if (self.hits + self.misses) > 0 else 0.0,
+            "hits": hits,
+            "misses": misses,
+            "evictions": sum(st["evictions"] for st in per_shard),
+            "expired": sum(st["expired"] for st in per_shard),
+            "hit_rate": hits / (hits + misses) if (hits + misses) > 0 else 0.0,
+            "shards": len(self._shards),
         }
@@ -7,6 +7,7 @@ import sys
 from typing import Optional
 
 from .core import BrainCore
+from .utils import run_async
 
 
 def _cmd_run(args: argparse.Namespace) -> int:
@@ -25,7 +26,7 @@ def _cmd_run(args: argparse.Namespace) -> int:
         except KeyboardInterrupt:
             await brain.shutdown()
 
-    asyncio.run(runner())
+    run_async(runner())
     return 0
 
 
@@ -72,7 +73,7 @@ def _cmd_train(args: argparse.Namespace) -> int:
         print(json.dumps(report.recommended_config, ensure_ascii=False, indent=2))
         await brain.shutdown()
 
-    asyncio.run(runner())
+    run_async(runner())
     return 0
 
 
@@ -91,7 +92,7 @@ def _cmd_demo(args: argparse.Namespace) -> int:
 
     demo_main = getattr(mod, "main")
     if inspect.iscoroutinefunction(demo_main):
-        asyncio.run(demo_main(config_path=args.config))
+        run_async(demo_main(config_path=args.config))
         return 0
     demo_main(config_path=args.config)
     return 0
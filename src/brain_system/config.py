@@ -1,14 +1,16 @@
 from __future__ import annotations
 
-import json
 import logging
 import os
+import sys
 import threading
 import time
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Callable, Optional
 
+from .utils.json_codec import loads as _json_loads
+
 
 ConfigListener = Callable[[dict[str, Any]], None]
 
@@ -18,6 +20,42 @@ MAX_CONFIG_SOURCE_FILE_BYTES = 1024 * 1024  # 1MB
 MAX_CONSUL_ITEMS = 1024
 MAX_CONSUL_VALUE_BYTES = 256 * 1024  # 256KB
 
+# 同一类加载告警的最小间隔，避免损坏的配置文件在轮询中刷屏
+LOAD_WARNING_INTERVAL_SECONDS = 30.0
+
+# 网络/远程文件系统：inotify 等本地事件收不到其他主机的写入，只能轮询
+_NETWORK_FS_TYPES = frozenset({
+    "nfs", "nfs4", "cifs", "smb3", "smbfs", "ncpfs", "afs", "9p",
+    "ceph", "glusterfs", "lustre", "gpfs", "fuse.sshfs", "fuse.glusterfs",
+})
+_PROC_MOUNTS = "/proc/mounts"
+
+
+def _is_network_fs(path: Path) -> bool:
+    """判断 path 是否位于网络文件系统上（仅 Linux，依据 /proc/mounts）。"""
+    if not sys.platform.startswith("linux"):
+        return False
+    try:
+        target = os.path.realpath(path)
+        with open(_PROC_MOUNTS, encoding="utf-8", errors="replace") as f:
+            mounts = f.read().splitlines()
+    except OSError:
+        return False
+
+    best_len = -1
+    best_type = ""
+    for line in mounts:
+        parts = line.split()
+        if len(parts) < 3:
+            continue
+        # /proc/mounts 中空格等字符以八进制转义（如 \040）
+        mount_point = parts[1].encode("latin-1", "backslashreplace").decode("unicode_escape")
+        prefix = mount_point.rstrip("/") + "/"
+        if (target == mount_point or target.startswith(prefix)) and len(mount_point) > best_len:
+            best_len = len(mount_point)
+            best_type = parts[2]
+    return best_type in _NETWORK_FS_TYPES
+
 
 @dataclass(slots=True)
 class ConfigSource:
@@ -37,53 +75,141 @@ class ConfigSource:
 
 
 class FileConfigSource(ConfigSource):
+    """本地 JSON 文件配置源。
+
+    已安装 watchdog（pip install 'brain-system[config]'）时基于文件系统事件
+    （Linux inotify / macOS FSEvents）触发重载；未安装或文件位于网络文件系统
+    （NFS/SMB 等收不到远程写入事件）时回退为按 poll_seconds 轮询文件签名（mtime_ns/size/inode）。
+    """
+
     def __init__(self, path: str, poll_seconds: float = 1.0):
         self._path = Path(path)
         self._poll_seconds = float(poll_seconds)
         self._stop = threading.Event()
         self._thread: Optional[threading.Thread] = None
-        self._last_mtime: Optional[float] = None
+        self._observer: Any = None
+        # (st_mtime_ns, st_size, st_ino)：整数比较，避免浮点 mtime 精度问题并捕获同 mtime 的快速重写
+        self._last_sig: Optional[tuple[int, int, int]] = None
+        self._check_lock = threading.Lock()
+        self._last_warn_ts = 0.0
+        self._last_warn_sig: Optional[str] = None
 
     def load(self) -> dict[str, Any]:
         if not self._path.exists():
             return {}
         try:
             if self._path.stat().st_size > MAX_CONFIG_SOURCE_FILE_BYTES:
-                logging.warning("配置文件过大，拒绝加载: %s", self._path)
+                self._warn("too_large", "配置文件过大，拒绝加载: %s", self._path)
                 return {}
 
-            data = json.loads(self._path.read_text(encoding="utf-8"))
+            data = _json_loads(self._path.read_bytes())
             if not isinstance(data, dict):
-                logging.warning("配置文件根节点必须为对象(dict): %s", self._path)
+                self._warn("non_dict_root", "配置文件根节点必须为对象(dict): %s", self._path)
                 return {}
-            return data
+            self._last_warn_sig = None
+            # 顶层键在每次重载中反复出现，驻留后跨重载共享同一对象
+            return {sys.intern(k): v for k, v in data.items()}
         except Exception as e:
-            logging.warning("配置文件解析失败: %s", e)
+            self._warn(type(e).__name__, "配置文件解析失败: %s", e)
             return {}
 
+    def _warn(self, sig: str, msg: str, *args: Any) -> None:
+        """限频告警：同一签名在间隔内只记录一次，签名变化时立即记录。"""
+        now = time.monotonic()
+        if sig == self._last_warn_sig and now - self._last_warn_ts < LOAD_WARNING_INTERVAL_SECONDS:
+            return
+        self._last_warn_sig = sig
+        self._last_warn_ts = now
+        logging.warning(
+            msg,
+            *args,
+            extra={"config_path": str(self._path), "config_error": sig},
+        )
+
+    def _check_changed(self, listener: ConfigListener) -> None:
+        """文件签名变化时通知 listener；同一次写入触发的多个事件会被合并。"""
+        with self._check_lock:
+            try:
+                st = os.stat(self._path)
+            except OSError:
+                return
+            sig = (st.st_mtime_ns, st.st_size, st.st_ino)
+            if self._last_sig is None:
+                self._last_sig = sig
+                return
+            if sig == self._last_sig:
+                return
+            self._last_sig = sig
+        listener(self.load())
+
+    def _start_event_watch(self, listener: ConfigListener) -> bool:
+        """尝试用 watchdog 监听父目录；不可用时返回 False。"""
+        try:
+            from watchdog.events import FileSystemEventHandler  # type: ignore
+            from watchdog.observers import Observer  # type: ignore
+        except Exception:
+            return False
+
+        watch_dir = self._path.parent if str(self._path.parent) else Path(".")
+        if not watch_dir.is_dir():
+            return False
+        if _is_network_fs(watch_dir):
+            logging.info("配置文件位于网络文件系统，使用轮询监听: %s", self._path)
+            return False
+
+        name = self._path.name
+        source = self
+
+        class _Handler(FileSystemEventHandler):  # type: ignore[misc]
+            def on_any_event(self, event: Any) -> None:
+                paths = (getattr(event, "src_path", ""), getattr(event, "dest_path", ""))
+                if any(p and os.path.basename(os.fsdecode(p)) == name for p in paths):
+                    try:
+                        source._check_changed(listener)
+                    except Exception:
+                        pass
+
+        try:
+            observer = Observer()
+            observer.schedule(_Handler(), str(watch_dir), recursive=False)
+            observer.daemon = True
+            observer.start()
+        except Exception as e:
+            logging.debug("watchdog 启动失败，回退为轮询: %s", e)
+            return False
+
+        self._observer = observer
+        return True
+
     def start_watch(self, listener: ConfigListener) -> None:
-        if self._thread is not None:
+        if self._thread is not None or self._observer is not None:
+            return
+
+        # 记录基线签名，之后只在变化时通知
+        self._check_changed(listener)
+        if self._start_event_watch(listener):
             return
 
         def run() -> None:
             while not self._stop.is_set():
                 try:
-                    if self._path.exists():
-                        mtime = self._path.stat().st_mtime
-                        if self._last_mtime is None:
-                            self._last_mtime = mtime
-                        elif mtime != self._last_mtime:
-                            self._last_mtime = mtime
-                            listener(self.load())
+                    self._check_changed(listener)
                 except Exception:
                     pass
-                time.sleep(self._poll_seconds)
+                self._stop.wait(self._poll_seconds)
 
         self._thread = threading.Thread(target=run, daemon=True)
         self._thread.start()
 
     def stop_watch(self) -> None:
         self._stop.set()
+        if self._observer is not None:
+            try:
+                self._observer.stop()
+                self._observer.join(timeout=self._poll_seconds + 0.2)
+            except Exception:
+                pass
+            self._observer = None
         if self._thread is not None and self._thread.is_alive():
             self._thread.join(timeout=self._poll_seconds + 0.2)
         self._thread = None
@@ -107,14 +233,22 @@ class ConsulConfigSource(ConfigSource):
         self._consul = consul.Consul(host=self._host, port=self._port)
 
     def load(self) -> dict[str, Any]:
-        data: dict[str, Any] = {}
         idx, items = self._consul.kv.get(self._key_prefix, recurse=True)
         self._last_index = idx
+        return self._parse(items)
+
+    def _parse(self, items: Any) -> dict[str, Any]:
+        """把 kv.get(recurse=True) 返回的条目解析为配置字典。"""
+        data: dict[str, Any] = {}
         if not items:
             return {}
         if isinstance(items, list) and len(items) > MAX_CONSUL_ITEMS:
             logging.warning("Consul 配置项过多，已截断到前 %d 项", MAX_CONSUL_ITEMS)
             items = items[:MAX_CONSUL_ITEMS]
+        # 循环不变量提前绑定为局部变量
+        prefix_len = len(self._key_prefix) + 1
+        loads = _json_loads
+        intern = sys.intern
         for it in items:
             key = it.get("Key")
             val = it.get("Value")
@@ -124,8 +258,7 @@ class ConsulConfigSource(ConfigSource):
                 logging.warning("Consul 配置值过大，已跳过键: %s", key)
                 continue
             try:
-                rel = str(key)[len(self._key_prefix) + 1 :]
-                data[rel] = json.loads(val.decode("utf-8"))
+                data[intern(key[prefix_len:])] = loads(val)
             except Exception:
                 continue
         return data
@@ -135,14 +268,18 @@ class ConsulConfigSource(ConfigSource):
             return
 
         def run() -> None:
+            # 阻塞式 index 长轮询：有变更立即返回，无需额外 sleep；仅在异常时退避
             while not self._stop.is_set():
                 try:
-                    idx, _ = self._consul.kv.get(self._key_prefix, recurse=True, index=self._last_index, wait="10s")
+                    idx, items = self._consul.kv.get(
+                        self._key_prefix, recurse=True, index=self._last_index, wait="30s"
+                    )
                     if idx and idx != self._last_index:
-                        listener(self.load())
+                        self._last_index = idx
+                        # 直接复用阻塞查询返回的条目，避免再请求一次 Consul
+                        listener(self._parse(items))
                 except Exception:
-                    pass
-                time.sleep(self._poll_seconds)
+                    self._stop.wait(self._poll_seconds)
 
         self._thread = threading.Thread(target=run, daemon=True)
         self._thread.start()
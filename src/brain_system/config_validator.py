@@ -152,12 +152,14 @@ DEFAULT_CONFIG: Dict[str, Any] = {
     "cache_size_mb": 256,
     "cache_max_entries": 10_000,
     "cache_ttl_seconds": 300,
+    "cache_shards": 2 * multiprocessing.cpu_count(),
     "log_level": "INFO",
     "log_json": False,
     "monitoring_interval": 5.0,
     "auto_load_dlcs": True,
     "dlc_search_paths": ["./dlcs"],
     "dlc_strict_dependency_check": True,
+    "dlc_parallel_load": True,
     
     "dlc_signature_required": False,
     "dlc_signature_verify_if_present": True,
@@ -180,6 +182,11 @@ DEFAULT_CONFIG: Dict[str, Any] = {
     "cpu_task_prefixes": ["cpu_", "cpu_task", "thread_cpu_"],
     "io_task_prefixes": ["io_", "net_", "disk_"],
     "process_pool_payload_max_bytes": 262_144,
+    "process_pool_start_method": "auto",  # auto|fork|forkserver|spawn
+    "process_pool_preload": [],
+    "process_pool_max_tasks_per_child": 1000,
+    "process_pool_warmup": False,
+    "process_pool_shm_min_bytes": 262_144,  # 0 表示不使用共享内存传参
     "thread_pool_size_small_core": min(max(multiprocessing.cpu_count() * 2, 4), 16),
     "process_pool_size_small_core": max(0, min(multiprocessing.cpu_count() // 2, 4)),
     "executor_routing_strategy_small_core": "latency",
@@ -265,6 +272,20 @@ class ConfigValidator:
                     f"cache_ttl_seconds must be a positive number, got {val}"
                 )
         
+        if "cache_shards" in config:
+            val = config["cache_shards"]
+            if not isinstance(val, int) or val <= 0:
+                self._errors.append(
+                    f"cache_shards must be a positive integer, got {val}"
+                )
+        
+        if config.get("cache_snapshot_max_entries") is not None:
+            val = config["cache_snapshot_max_entries"]
+            if not isinstance(val, int) or val < 0:
+                self._errors.append(
+                    f"cache_snapshot_max_entries must be a non-negative integer, got {val}"
+                )
+        
         if "cache_size_mb" in config:
             val = config["cache_size_mb"]
             if not isinstance(val, int) or val <= 0:
@@ -385,6 +406,30 @@ class ConfigValidator:
                     f"process_pool_payload_max_bytes must be an integer >= 1024, got {val}"
                 )
 
+        if "process_pool_start_method" in config:
+            val = str(config["process_pool_start_method"]).lower()
+            if val not in ("auto", "fork", "forkserver", "spawn"):
+                self._errors.append(
+                    f"process_pool_start_method must be one of ('auto', 'fork', 'forkserver', 'spawn'), got {config['process_pool_start_method']}"
+                )
+
+        if "process_pool_shm_min_bytes" in config:
+            val = config["process_pool_shm_min_bytes"]
+            if not isinstance(val, int) or val < 0:
+                self._errors.append(
+                    f"process_pool_shm_min_bytes must be a non-negative integer, got {val}"
+                )
+
+        if "process_pool_preload" in config and not isinstance(config["process_pool_preload"], list):
+            self._errors.append("process_pool_preload must be a list")
+
+        if "process_pool_max_tasks_per_child" in config:
+            val = config["process_pool_max_tasks_per_child"]
+            if not isinstance(val, int) or val < 0:
+                self._errors.append(
+                    f"process_pool_max_tasks_per_child must be a non-negative integer, got {val}"
+                )
+
         for payload_key in [
             "process_pool_payload_max_bytes_small_core",
             "process_pool_payload_max_bytes_large_core",
@@ -1,37 +1,70 @@
 from __future__ import annotations
 
 import asyncio
+import functools
 import hashlib
+import heapq
 import json
 import logging
 import multiprocessing
 import os
+import sys
+import threading
 import time
+import weakref
 from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from logging.handlers import RotatingFileHandler
 from pathlib import Path
-from typing import Any, Callable, Dict, Optional, Set, Tuple
-
-from packaging.specifiers import SpecifierSet
-from packaging.version import Version
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Set, Tuple
 
 from .discovery import iter_dlc_files, load_dlc_classes_from_file
 from .dlc import BrainDLC
 from .models import DLCManifest
 
-from .cache import LruTtlCache
+from .cache import ShardedLruTtlCache
 from .observability import build_observability, start_span
 from .retry import RetryPolicy, async_retry
 from .security import SignatureVerificationError, load_public_keys_from_files, verify_dlc_signature
 from .config import ConsulConfigSource, FileConfigSource
 from .config_validator import build_config, validate_config
 from .ha import LeaderElectionConfig, LeaderElector
+from .utils.json_codec import loads as _json_loads
+
+if TYPE_CHECKING:
+    from packaging.specifiers import SpecifierSet
+    from packaging.version import Version
 
 
 try:
-    import psutil  # type: ignore
-except Exception:  # pragma: no cover
-    psutil = None
+    import xxhash  # type: ignore
+
+    def _digest_key(data: bytes) -> str:
+        return xxhash.xxh3_128_hexdigest(data)
+
+except Exception:  # pragma: no cover - 取决于环境
+
+    def _digest_key(data: bytes) -> str:
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+# 未配置 cpu_task_prefixes / io_task_prefixes（或配置非列表）时的路由前缀
+_DEFAULT_CPU_TASK_PREFIXES = ("cpu_", "cpu_task", "thread_cpu_")
+_DEFAULT_IO_TASK_PREFIXES = ("io_", "net_", "disk_")
+
+# 空闲（无新任务）时监控等待时间逐次翻倍，最多为 monitoring_interval 的该倍数
+MONITOR_IDLE_MAX_MULTIPLIER = 8
+
+# 结果缓存每个分片至少容纳的条目数；分片过小时哈希不均会提前淘汰仍在容量内的条目
+RESULT_CACHE_MIN_ENTRIES_PER_SHARD = 64
+
+
+def _result_cache_shards(requested: int, max_entries: int) -> int:
+    """按容量收紧结果缓存分片数：不超过 max_entries // RESULT_CACHE_MIN_ENTRIES_PER_SHARD。
+
+    上限向下取整为 2 的幂，缓存再把分片数向上取整为 2 的幂时也不会越过它。
+    """
+    cap = max(1, max_entries // RESULT_CACHE_MIN_ENTRIES_PER_SHARD)
+    return max(1, min(requested, 1 << (cap.bit_length() - 1)))
 
 
 def _invoke_callable(func: Callable[..., Any], args: tuple[Any, ...], kwargs: Dict[str, Any]) -> Any:
@@ -39,6 +72,83 @@ def _invoke_callable(func: Callable[..., Any], args: tuple[Any, ...], kwargs: Di
     return func(*args, **kwargs)
 
 
+@functools.lru_cache(maxsize=4096)
+def _parse_dependency_spec(raw: str) -> tuple[str, SpecifierSet]:
+    """解析依赖声明（按字符串缓存，DLC 多轮注册时同一声明只解析一次）。
+
+    支持：
+    - "Brain Core"（无版本约束）
+    - "Brain Core>=1.0.0,<2"（语义化版本约束）
+
+    V-017 Fix: 增强输入验证，防止注入攻击
+    """
+
+    # packaging 导入较重，只在解析依赖时加载
+    from packaging.specifiers import SpecifierSet
+
+    s = str(raw).strip()
+    if not s:
+        return "", SpecifierSet("")
+
+    # V-017 Fix: Validate input to prevent injection
+    # Only allow alphanumeric, dash, underscore, dot, and version operators
+    import re
+    if not re.match(r'^[a-zA-Z0-9_\-.\s><=!~,]+$', s):
+        logging.warning(f"Invalid dependency declaration (suspicious characters): {s[:50]}")
+        return "", SpecifierSet("")
+
+    # Limit length to prevent DoS
+    if len(s) > 200:
+        logging.warning(f"Dependency declaration too long: {len(s)} chars")
+        s = s[:200]
+
+    first_op = None
+    for i, ch in enumerate(s):
+        if ch in "<>=!~":
+            first_op = i
+            break
+
+    if first_op is None:
+        return s, SpecifierSet("")
+
+    name = s[:first_op].strip()
+    spec = s[first_op:].strip()
+
+    # V-017 Fix: Validate name doesn't contain version operators
+    if any(op in name for op in ['>=', '<=', '==', '!=', '~=', '>', '<']):
+        logging.warning(f"Invalid dependency name: {name}")
+        return "", SpecifierSet("")
+
+    try:
+        return name, SpecifierSet(spec)
+    except Exception as e:
+        logging.warning(f"Invalid version specifier '{spec}': {e}")
+        return name, SpecifierSet("")
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_version(text: str) -> Version:
+    """解析版本号（按字符串缓存）。"""
+    from packaging.version import Version
+
+    return Version(text)
+
+
+class _ThreadPoolView(ThreadPoolExecutor):
+    """把任务转交给 BrainCore.thread_pool 的执行器视图，用作事件循环的默认执行器。
+
+    asyncio 要求默认执行器是 ThreadPoolExecutor，并会在 asyncio.run() 结束时将其关闭；
+    视图自身不创建线程，被关闭也不影响 BrainCore 持有的线程池。
+    """
+
+    def __init__(self, target: ThreadPoolExecutor) -> None:
+        super().__init__(max_workers=1)
+        self._target = target
+
+    def submit(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Any:
+        return self._target.submit(fn, *args, **kwargs)
+
+
 class BrainCore:
     """Core Scheduler: Task Dispatch + DLC Management + Observability."""
 
@@ -60,9 +170,15 @@ class BrainCore:
         self.dlc_dependencies: Dict[str, Set[str]] = {}
 
         self.computational_units: Dict[str, Any] = {}
-        self.result_cache = LruTtlCache(
-            max_entries=int(self.config.get("cache_max_entries", 10_000)),
+        # compute() 并发读写结果缓存：按键哈希分片，各分片独立加锁以降低竞争
+        cache_max_entries = int(self.config.get("cache_max_entries", 10_000))
+        self.result_cache = ShardedLruTtlCache(
+            max_entries=cache_max_entries,
             ttl_seconds=float(self.config.get("cache_ttl_seconds", 300.0)),
+            shards=_result_cache_shards(
+                int(self.config.get("cache_shards", 2 * multiprocessing.cpu_count())),
+                cache_max_entries,
+            ),
         )
 
         self.performance_stats: Dict[str, Any] = {
@@ -75,7 +191,14 @@ class BrainCore:
             "process_dispatched_tasks": 0,
         }
 
+        self._stats_lock = threading.Lock()
+        self._compute_time_total = 0.0
+
         self.monitor_task: Optional[asyncio.Task[None]] = None
+        self._monitor_kick: Optional[asyncio.Event] = None
+        self._monitor_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._prefix_cache: dict[str, tuple[Any, tuple[str, ...]]] = {}
+        self._default_executor_loops: weakref.WeakSet[asyncio.AbstractEventLoop] = weakref.WeakSet()
         self._last_valid_config: dict[str, Any] = {}
 
         # 资源池（兼容 DLC 直接使用 thread_pool/process_pool 的写法）
@@ -86,11 +209,12 @@ class BrainCore:
             max_workers=thread_pool_size,
             thread_name_prefix="BrainWorker"
         )
+        self._thread_pool_max_workers = thread_pool_size
         
         # 进程池默认：min(CPU核心数, 8)，进程开销大
         default_process_pool_size = min(multiprocessing.cpu_count(), 8)
         process_pool_size = int(self.config.get("process_pool_size", default_process_pool_size))
-        self.process_pool = ProcessPoolExecutor(max_workers=process_pool_size) if process_pool_size > 0 else None
+        self.process_pool = self._build_process_pool(process_pool_size) if process_pool_size > 0 else None
         self._process_pool_max_workers = process_pool_size
 
         self.retry_policy = RetryPolicy(
@@ -123,53 +247,8 @@ class BrainCore:
         return build_config(config_path)
 
     def _parse_dependency(self, raw: str) -> tuple[str, SpecifierSet]:
-        """解析依赖声明。
-
-        支持：
-        - "Brain Core"（无版本约束）
-        - "Brain Core>=1.0.0,<2"（语义化版本约束）
-
-        V-017 Fix: 增强输入验证，防止注入攻击
-        """
-
-        s = str(raw).strip()
-        if not s:
-            return "", SpecifierSet("")
-
-        # V-017 Fix: Validate input to prevent injection
-        # Only allow alphanumeric, dash, underscore, dot, and version operators
-        import re
-        if not re.match(r'^[a-zA-Z0-9_\-.\s><=!~,]+$', s):
-            logging.warning(f"Invalid dependency declaration (suspicious characters): {s[:50]}")
-            return "", SpecifierSet("")
-
-        # Limit length to prevent DoS
-        if len(s) > 200:
-            logging.warning(f"Dependency declaration too long: {len(s)} chars")
-            s = s[:200]
-
-        first_op = None
-        for i, ch in enumerate(s):
-            if ch in "<>=!~":
-                first_op = i
-                break
-
-        if first_op is None:
-            return s, SpecifierSet("")
-
-        name = s[:first_op].strip()
-        spec = s[first_op:].strip()
-
-        # V-017 Fix: Validate name doesn't contain version operators
-        if any(op in name for op in ['>=', '<=', '==', '!=', '~=', '>', '<']):
-            logging.warning(f"Invalid dependency name: {name}")
-            return "", SpecifierSet("")
-
-        try:
-            return name, SpecifierSet(spec)
-        except Exception as e:
-            logging.warning(f"Invalid version specifier '{spec}': {e}")
-            return name, SpecifierSet("")
+        """解析依赖声明，见 _parse_dependency_spec。"""
+        return _parse_dependency_spec(str(raw))
 
     def _validate_dependency(self, dep_raw: str) -> None:
         name, spec = self._parse_dependency(dep_raw)
@@ -182,7 +261,7 @@ class BrainCore:
         if name in core_aliases:
             if str(spec):
                 try:
-                    ver = Version(str(self.version))
+                    ver = _parse_version(str(self.version))
                 except Exception as e:
                     raise RuntimeError(f"核心版本不可解析: {self.version}") from e
                 if ver not in spec:
@@ -194,7 +273,7 @@ class BrainCore:
 
         if str(spec):
             try:
-                ver = Version(str(self.dlc_manifests[name].version))
+                ver = _parse_version(str(self.dlc_manifests[name].version))
             except Exception as e:
                 raise RuntimeError(f"依赖 DLC 版本不可解析: {name}={self.dlc_manifests[name].version}") from e
 
@@ -339,6 +418,13 @@ class BrainCore:
             self.config = old_config
             return
 
+        # ThreadPoolExecutor 不支持运行中调整：已启动的线程会一直从队列取任务，
+        # 且空闲计数会让调高的上限迟迟不创建新线程，因此与进程池一样需重启生效
+        if "thread_pool_size" in new_config and int(new_config["thread_pool_size"]) != self._thread_pool_max_workers:
+            logging.info("thread_pool_size 变更需重启后生效")
+        if "process_pool_size" in new_config and int(new_config["process_pool_size"]) != self._process_pool_max_workers:
+            logging.info("process_pool_size 变更需重启后生效")
+
         # 公钥可能变化
         self._load_public_keys()
         
@@ -538,12 +624,23 @@ class BrainCore:
                 logging.debug("Failed to increment dlc_loaded metric: %s", e)
         return count
 
+    def _verify_and_load_classes(self, file_path: Path) -> list[type[BrainDLC]]:
+        """验签后读取单个文件中的 DLC 类；验签失败或读取出错返回空列表。"""
+        # 安全：exec 之前必须验签
+        if not self._verify_dlc_file_signature(file_path):
+            return []
+        try:
+            return load_dlc_classes_from_file(file_path)
+        except Exception as e:
+            logging.error("读取 DLC 类失败 %s: %s", file_path, e)
+            return []
+
     def load_all_dlcs(self, search_paths: Optional[list[str]] = None) -> int:
         """从搜索路径加载 DLC。
 
         生产行为：
-        - 尝试按 manifest.priority 升序注册
-        - 多轮注册以解决依赖顺序问题
+        - 按依赖关系拓扑排序后单遍注册，同时就绪的 DLC 按 manifest.priority 升序
+        - 循环依赖中的 DLC 不注册并输出错误
         """
 
         paths = search_paths or list(self.config.get("dlc_search_paths", ["./dlcs"]))
@@ -556,55 +653,64 @@ class BrainCore:
         except Exception as e:
             logging.debug("Path.is_relative_to not available (Python < 3.9?): %s", e)
 
+        # 各文件的验签与读取相互独立（文件 IO + 验签），多文件时并行提交到线程池；
+        # map 保持文件顺序，结果与串行一致
+        if len(dlc_files) > 1 and bool(self.config.get("dlc_parallel_load", True)):
+            results = list(self.thread_pool.map(self._verify_and_load_classes, dlc_files))
+        else:
+            results = [self._verify_and_load_classes(p) for p in dlc_files]
+
         candidates: list[type[BrainDLC]] = []
-        for file_path in dlc_files:
-            # 安全：exec 之前必须验签
-            if not self._verify_dlc_file_signature(file_path):
-                continue
-            try:
-                classes = load_dlc_classes_from_file(file_path)
-                candidates.extend(classes)
-            except Exception as e:
-                logging.error("读取 DLC 类失败 %s: %s", file_path, e)
+        for classes in results:
+            candidates.extend(classes)
 
-        # 读取 manifest.priority 进行排序（实例化不会 initialize）
-        scored: list[tuple[int, type[BrainDLC]]] = []
+        # 实例化一次读取 manifest（实例化不会 initialize），注册时复用同一实例
+        nodes: list[tuple[BrainDLC, DLCManifest]] = []
         for cls in candidates:
             try:
                 inst = cls(self)
-                scored.append((int(inst.get_manifest().priority), cls))
+                nodes.append((inst, inst.get_manifest()))
             except Exception:
                 continue
 
-        scored.sort(key=lambda x: x[0])
-        pending = [c for _, c in scored]
+        # 依赖图只包含本批候选之间的边；指向核心或已注册 DLC 的依赖由 register_dlc 校验
+        index_by_name: dict[str, list[int]] = {}
+        for i, (_, manifest) in enumerate(nodes):
+            index_by_name.setdefault(manifest.name, []).append(i)
 
-        loaded = 0
-        progressed = True
-        while pending and progressed:
-            progressed = False
-            next_pending: list[type[BrainDLC]] = []
-            for cls in pending:
-                try:
-                    inst = cls(self)
-                    # allow_replace=False：避免静默替换，热升级用 reload_dlc_file
-                    self.register_dlc(inst)
-                    loaded += 1
-                    progressed = True
-                except Exception as e:
-                    next_pending.append(cls)
-                    logging.debug("DLC 延迟注册 %s: %s", getattr(cls, "__name__", str(cls)), e)
-            pending = next_pending
+        dependents: list[list[int]] = [[] for _ in nodes]
+        in_degree = [0] * len(nodes)
+        for i, (_, manifest) in enumerate(nodes):
+            for dep in manifest.dependencies:
+                dep_name = self._parse_dependency(dep)[0]
+                for j in index_by_name.get(dep_name, ()):
+                    if j != i:
+                        dependents[j].append(i)
+                        in_degree[i] += 1
+
+        # Kahn 拓扑排序；入度为 0 的节点按 (priority, 发现顺序) 出队
+        ready = [(int(m.priority), i) for i, (_, m) in enumerate(nodes) if in_degree[i] == 0]
+        heapq.heapify(ready)
 
-        # 如果仍有 pending，输出明确错误
-        for cls in pending:
+        loaded = 0
+        while ready:
+            _, i = heapq.heappop(ready)
+            inst, manifest = nodes[i]
             try:
-                name = getattr(cls, "__name__", str(cls))
-                inst = cls(self)
-                manifest = inst.get_manifest()
-                logging.error("DLC 注册失败(依赖未满足或版本冲突): %s deps=%s", name, manifest.dependencies)
-            except Exception:
-                logging.error("DLC 注册失败(无法解析 manifest): %s", getattr(cls, "__name__", str(cls)))
+                self.register_dlc(inst)
+                loaded += 1
+            except Exception as e:
+                logging.error("DLC 注册失败(依赖未满足或版本冲突): %s deps=%s (%s)", manifest.name, manifest.dependencies, e)
+            # 依赖注册失败时，下游会在 register_dlc 的依赖校验中报错
+            for k in dependents[i]:
+                in_degree[k] -= 1
+                if in_degree[k] == 0:
+                    heapq.heappush(ready, (int(nodes[k][1].priority), k))
+
+        # 仍有入度的节点处于依赖环中
+        for i, (_, manifest) in enumerate(nodes):
+            if in_degree[i] > 0:
+                logging.error("DLC 注册失败(循环依赖或依赖于环中的 DLC): %s deps=%s", manifest.name, manifest.dependencies)
 
         logging.info("已加载 %d 个DLC类（来自 %d 个文件）", loaded, len(dlc_files))
         return loaded
@@ -670,16 +776,16 @@ class BrainCore:
         cache_key = self._generate_cache_key(func, *args, **kwargs)
         cached = self.result_cache.get(cache_key)
         if cached is not None:
-            if self.obs.metrics_enabled and self.obs.cache_hits is not None:
+            if self.obs.metrics_enabled:
                 try:
-                    self.obs.cache_hits.inc()
+                    self.obs.record_cache_hit()
                 except Exception as e:
                     logging.debug("Failed to increment cache_hits metric: %s", e)
             return cached
 
-        if self.obs.metrics_enabled and self.obs.cache_misses is not None:
+        if self.obs.metrics_enabled:
             try:
-                self.obs.cache_misses.inc()
+                self.obs.record_cache_miss()
             except Exception as e:
                 logging.debug("Failed to increment cache_misses metric: %s", e)
 
@@ -687,20 +793,35 @@ class BrainCore:
         slow_task_threshold = float(self.config.get("slow_task_threshold", 5.0))
 
         async def _run_once() -> Any:
+            loop = asyncio.get_running_loop()
+            self._ensure_default_executor(loop)
+
             if asyncio.iscoroutinefunction(func):
                 return await func(*args, **kwargs)
 
-            loop = asyncio.get_running_loop()
-
             executor_kind = self._select_executor_kind(task_id=task_id, priority=priority, args=args, kwargs=kwargs)
             if executor_kind == "process" and self.process_pool is not None:
                 self.performance_stats["process_dispatched_tasks"] += 1
-                return await loop.run_in_executor(self.process_pool, _invoke_callable, func, args, kwargs)
+                # 大 numpy 数组经共享内存传给子进程，避免 pickle + 管道整块复制
+                from .shm import SHM_MIN_BYTES, export_shared_arrays, invoke_with_shared_arrays, release_shared_arrays
+
+                shm_args, shm_kwargs, segments = export_shared_arrays(
+                    args, kwargs, int(self.config.get("process_pool_shm_min_bytes", SHM_MIN_BYTES))
+                )
+                if not segments:
+                    return await loop.run_in_executor(self.process_pool, _invoke_callable, func, args, kwargs)
+                try:
+                    return await loop.run_in_executor(
+                        self.process_pool, invoke_with_shared_arrays, func, shm_args, shm_kwargs
+                    )
+                finally:
+                    release_shared_arrays(segments)
 
             self.performance_stats["thread_dispatched_tasks"] += 1
             return await loop.run_in_executor(self.thread_pool, _invoke_callable, func, args, kwargs)
 
-        start_time = time.time()
+        # 耗时用单调时钟，不受系统时间调整影响
+        start_time = time.perf_counter()
         
         SLOW_TASKS_MAX_SIZE = 100
         
@@ -744,41 +865,45 @@ class BrainCore:
                         result = await _run_once()
                         
             except asyncio.TimeoutError as e:
-                elapsed = time.time() - start_time
+                elapsed = time.perf_counter() - start_time
                 _check_slow_task(elapsed)
-                if self.obs.metrics_enabled and self.obs.task_errors is not None:
+                if self.obs.metrics_enabled:
                     try:
-                        self.obs.task_errors.labels(task_id=str(task_id)).inc()
+                        self.obs.inc_task_errors(self._task_kind(task_id))
                     except Exception as metric_err:
                         logging.debug("Failed to increment task_errors metric: %s", metric_err)
                 logging.error("计算任务超时 %s: %.2fs > %.2fs", task_id, elapsed, effective_timeout)
                 raise TimeoutError(f"Task {task_id} timed out after {elapsed:.2f}s") from e
             except Exception as e:
-                elapsed = time.time() - start_time
+                elapsed = time.perf_counter() - start_time
                 _check_slow_task(elapsed)
-                if self.obs.metrics_enabled and self.obs.task_errors is not None:
+                if self.obs.metrics_enabled:
                     try:
-                        self.obs.task_errors.labels(task_id=str(task_id)).inc()
+                        self.obs.inc_task_errors(self._task_kind(task_id))
                     except Exception as metric_err:
                         logging.debug("Failed to increment task_errors metric: %s", metric_err)
                 logging.error("计算任务失败 %s: %s", task_id, e)
                 raise
 
-        elapsed = time.time() - start_time
+        elapsed = time.perf_counter() - start_time
         _check_slow_task(elapsed)
         
         self.result_cache.set(cache_key, result)
 
-        if self.obs.metrics_enabled and self.obs.task_seconds is not None:
+        if self.obs.metrics_enabled:
             try:
-                self.obs.task_seconds.labels(task_id=str(task_id)).observe(elapsed)
+                self.obs.observe_task_seconds(self._task_kind(task_id), elapsed)
             except Exception as e:
                 logging.debug("Failed to observe task_seconds metric: %s", e)
 
-        self.performance_stats["completed_tasks"] += 1
-        completed = self.performance_stats["completed_tasks"]
-        prev_avg = float(self.performance_stats["avg_compute_time"])
-        self.performance_stats["avg_compute_time"] = ((prev_avg * (completed - 1)) + elapsed) / completed
+        # 累计总耗时再相除：避免 prev_avg * (n - 1) 逐次累积舍入误差；
+        # 加锁使多个事件循环（线程）并发完成任务时计数与均值保持一致
+        stats = self.performance_stats
+        with self._stats_lock:
+            self._compute_time_total += elapsed
+            completed = stats["completed_tasks"] + 1
+            stats["completed_tasks"] = completed
+            stats["avg_compute_time"] = self._compute_time_total / completed
 
         return result
 
@@ -789,11 +914,66 @@ class BrainCore:
         except Exception:
             return 0
 
-    def _matches_prefixes(self, value: str, prefixes: list[str]) -> bool:
-        for prefix in prefixes:
-            if value.startswith(str(prefix)):
-                return True
-        return False
+    def _task_prefixes(self, key: str, default: tuple[str, ...]) -> tuple[str, ...]:
+        """返回配置项 key 对应的前缀元组。
+
+        按配置列表对象的身份缓存：配置热更新/回滚会替换为新的列表对象，缓存随之失效。
+        """
+        raw = self.config.get(key, default)
+        cached = self._prefix_cache.get(key)
+        if cached is not None and cached[0] is raw:
+            return cached[1]
+        prefixes = tuple(str(x) for x in raw) if isinstance(raw, list) else default
+        self._prefix_cache[key] = (raw, prefixes)
+        return prefixes
+
+    def _task_kind(self, task_id: Any) -> str:
+        """按路由前缀把任务归为 cpu/io/other，作为指标标签（取值有限）。"""
+        task_name = str(task_id)
+        if task_name.startswith(self._task_prefixes("cpu_task_prefixes", _DEFAULT_CPU_TASK_PREFIXES)):
+            return "cpu"
+        if task_name.startswith(self._task_prefixes("io_task_prefixes", _DEFAULT_IO_TASK_PREFIXES)):
+            return "io"
+        return "other"
+
+    def _build_process_pool(self, max_workers: int) -> ProcessPoolExecutor:
+        """创建常驻进程池。
+
+        - 启动方式：auto 时在支持的平台（非冻结打包）上使用 forkserver，
+          子进程从预加载了 brain_system.core 的 forkserver 派生，避免每个 worker 重复导入；
+          显式配置的方式当前平台不支持时记录警告并使用默认方式
+        - process_pool_max_tasks_per_child：worker 执行若干任务后自动替换，限制内存膨胀
+          （Python 3.11+，fork 方式不支持）
+        - process_pool_warmup：创建后立即拉起全部 worker，首个任务无需等待进程启动
+        """
+        method = str(self.config.get("process_pool_start_method", "auto")).lower()
+        if method == "auto":
+            frozen = bool(getattr(sys, "frozen", False))
+            method = "forkserver" if not frozen and "forkserver" in multiprocessing.get_all_start_methods() else ""
+        elif method not in multiprocessing.get_all_start_methods():
+            # 如 Windows 上配置了 fork：get_context 会直接抛 ValueError，导致 BrainCore 无法启动
+            logging.warning("当前平台不支持进程池启动方式 %s，改用默认方式", method)
+            method = ""
+
+        kwargs: Dict[str, Any] = {"max_workers": max_workers}
+        if method:
+            ctx = multiprocessing.get_context(method)
+            if method == "forkserver":
+                preload = ["brain_system.core"]
+                preload.extend(str(m) for m in self.config.get("process_pool_preload", []) or [])
+                ctx.set_forkserver_preload(preload)
+            kwargs["mp_context"] = ctx
+
+        max_tasks = int(self.config.get("process_pool_max_tasks_per_child", 1000) or 0)
+        if max_tasks > 0 and method != "fork" and sys.version_info >= (3, 11):
+            kwargs["max_tasks_per_child"] = max_tasks
+
+        pool = ProcessPoolExecutor(**kwargs)
+        if bool(self.config.get("process_pool_warmup", False)):
+            # 并发提交空任务，促使执行器一次性拉起全部 worker
+            for fut in [pool.submit(int) for _ in range(max_workers)]:
+                fut.result()
+        return pool
 
     def _select_executor_kind(
         self,
@@ -807,16 +987,9 @@ class BrainCore:
         task_name = str(task_id)
         strategy = str(self.config.get("executor_routing_strategy", "balanced")).lower()
 
-        cpu_prefixes = self.config.get("cpu_task_prefixes", ["cpu_", "cpu_task", "thread_cpu_"])
-        if not isinstance(cpu_prefixes, list):
-            cpu_prefixes = ["cpu_", "cpu_task", "thread_cpu_"]
-
-        io_prefixes = self.config.get("io_task_prefixes", ["io_", "net_", "disk_"])
-        if not isinstance(io_prefixes, list):
-            io_prefixes = ["io_", "net_", "disk_"]
-
-        is_cpu_hint = self._matches_prefixes(task_name, [str(x) for x in cpu_prefixes])
-        is_io_hint = self._matches_prefixes(task_name, [str(x) for x in io_prefixes])
+        # str.startswith 接受元组：一次 C 调用完成全部前缀匹配
+        is_cpu_hint = task_name.startswith(self._task_prefixes("cpu_task_prefixes", _DEFAULT_CPU_TASK_PREFIXES))
+        is_io_hint = task_name.startswith(self._task_prefixes("io_task_prefixes", _DEFAULT_IO_TASK_PREFIXES))
 
         payload_limit = int(self.config.get("process_pool_payload_max_bytes", 262_144))
         payload_size = self._estimate_payload_size(args, kwargs)
@@ -843,32 +1016,25 @@ class BrainCore:
             return "process"
         return "thread"
 
-    _cache_key_cache: dict[int, str] = {}
-    _cache_key_cache_max_size: int = 1000
-
     def _generate_cache_key(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> str:
-        func_name = getattr(func, "__name__", str(func))
-        
+        """生成结果缓存键：repr 作为规范化表示，128 位非加密摘要。
+
+        repr 由 C 实现，比逐项打包的 Python 序列化器更快；kwargs 按名排序，
+        使关键字参数顺序不同的调用共享缓存。摘要优先 xxh3_128，缺失时用 blake2b。
+        函数以 模块.限定名 标识，不同模块/类中的同名函数不会共用缓存。
+        """
+        qualname = getattr(func, "__qualname__", None)
+        if qualname is None:
+            func_name = getattr(func, "__name__", None) or str(func)
+        else:
+            func_name = f"{getattr(func, '__module__', None)}.{qualname}"
+
         try:
-            key_repr = repr((func_name, args, kwargs))
-            cache_key_hash = hash(key_repr)
-            
-            if cache_key_hash in self._cache_key_cache:
-                return self._cache_key_cache[cache_key_hash]
-            
-            key_str = f"{func_name}:{key_repr}"
-            result = hashlib.sha256(key_str.encode("utf-8")).hexdigest()
-            
-            if len(self._cache_key_cache) >= self._cache_key_cache_max_size:
-                oldest_key = next(iter(self._cache_key_cache))
-                del self._cache_key_cache[oldest_key]
-            
-            self._cache_key_cache[cache_key_hash] = result
-            return result
+            key_repr = repr((func_name, args, sorted(kwargs.items())))
         except Exception:
             key_data = (func_name, args, kwargs)
-            key_str = json.dumps(key_data, sort_keys=True, default=str)
-            return hashlib.sha256(key_str.encode("utf-8")).hexdigest()
+            key_repr = json.dumps(key_data, sort_keys=True, default=str)
+        return _digest_key(key_repr.encode("utf-8", "surrogatepass"))
 
     # ---------------- 监控 / 生命周期 ----------------
 
@@ -876,34 +1042,95 @@ class BrainCore:
         """启动性能监控。
 
         要求：必须在正在运行的事件循环中调用（即在 async 上下文里）。
+        每个周期等待 monitoring_interval 或 request_monitor_tick() 唤醒；
+        期间没有新任务时跳过采样与 DLC hooks，并逐步拉长等待时间。
         """
 
+        def run_hooks(hooks: list[tuple[BrainDLC, Callable[[Dict[str, Any]], Any]]]) -> None:
+            for dlc, hook in hooks:
+                try:
+                    hook(self.performance_stats)
+                except Exception as e:
+                    logging.debug("DLC monitor hook 失败 %s: %s", dlc.get_manifest().name, e)
+
         async def monitor() -> None:
+            kick = self._monitor_kick
+            assert kick is not None
+            try:
+                import psutil  # type: ignore
+            except Exception:  # pragma: no cover - 取决于环境
+                psutil = None
+            proc = psutil.Process() if psutil is not None else None
+            last_total: Optional[int] = None
+            idle_multiplier = 1
+
             while True:
-                await asyncio.sleep(float(self.config.get("monitoring_interval", 5.0)))
+                interval = float(self.config.get("monitoring_interval", 5.0))
+                try:
+                    await asyncio.wait_for(kick.wait(), timeout=interval * idle_multiplier)
+                    forced = True
+                except asyncio.TimeoutError:
+                    forced = False
+                kick.clear()
+
+                total = self.performance_stats["total_tasks"]
+                if not forced and total == last_total:
+                    idle_multiplier = min(idle_multiplier * 2, MONITOR_IDLE_MAX_MULTIPLIER)
+                    continue
+                last_total = total
+                idle_multiplier = 1
+
+                if self.obs.metrics_enabled:
+                    try:
+                        self.obs.flush_counters()
+                    except Exception as e:
+                        logging.debug("Failed to flush cache metrics: %s", e)
 
-                if psutil is not None:
+                if proc is not None:
                     try:
-                        self.performance_stats["memory_usage"] = psutil.Process().memory_info().rss / 1024 / 1024
-                        self.performance_stats["cpu_usage"] = psutil.cpu_percent()
+                        self.performance_stats["memory_usage"] = proc.memory_info().rss / 1024 / 1024
+                        # interval=None：非阻塞，返回与上次调用之间的 CPU 占用
+                        self.performance_stats["cpu_usage"] = psutil.cpu_percent(interval=None)
                     except Exception as e:
                         logging.debug("Failed to get system stats: %s", e)
 
+                hooks = []
                 for dlc in self.dlcs.values():
                     hook = getattr(dlc, "on_monitor_tick", None)
                     if callable(hook):
-                        try:
-                            hook(self.performance_stats)
-                        except Exception as e:
-                            logging.debug("DLC monitor hook 失败 %s: %s", dlc.get_manifest().name, e)
+                        hooks.append((dlc, hook))
+                if hooks:
+                    # 所有 hook 合并为一次线程调用，避免阻塞事件循环
+                    await asyncio.to_thread(run_hooks, hooks)
 
         try:
             loop = asyncio.get_running_loop()
         except RuntimeError as e:
             raise RuntimeError("start_performance_monitor() 必须在事件循环运行时调用") from e
 
+        self._ensure_default_executor(loop)
+        self._monitor_kick = asyncio.Event()
+        self._monitor_loop = loop
         self.monitor_task = loop.create_task(monitor())
 
+    def _ensure_default_executor(self, loop: asyncio.AbstractEventLoop) -> None:
+        """把 thread_pool 安装为事件循环的默认执行器（每个事件循环只做一次）。
+
+        使 DLC 等处的 asyncio.to_thread / run_in_executor(None, ...) 复用配置的线程池，
+        而不是另建一个 min(32, cpu+4) 的默认线程池。
+        """
+        if loop in self._default_executor_loops:
+            return
+        loop.set_default_executor(_ThreadPoolView(self.thread_pool))
+        self._default_executor_loops.add(loop)
+
+    def request_monitor_tick(self) -> None:
+        """立即唤醒性能监控执行一次采样（可在任意线程调用）。"""
+        loop, kick = self._monitor_loop, self._monitor_kick
+        if loop is None or kick is None or loop.is_closed():
+            return
+        loop.call_soon_threadsafe(kick.set)
+
     # ---------------- 健康检查 ----------------
 
     def health_check(self) -> Dict[str, Any]:
@@ -1071,6 +1298,12 @@ class BrainCore:
         if self.monitor_task:
             self.monitor_task.cancel()
 
+        if self.obs.metrics_enabled:
+            try:
+                self.obs.flush_counters()
+            except Exception as e:
+                logging.debug("Failed to flush cache metrics: %s", e)
+
         for dlc in list(self.dlcs.values()):
             try:
                 dlc.shutdown()
@@ -1107,19 +1340,43 @@ class BrainCore:
         self._load_cache()
 
     def _cleanup_old_cache(self) -> None:
-        cache_files = list(self.cache_dir.glob("*.cache"))
-        cache_files.sort(key=lambda x: x.stat().st_mtime)
+        """按 mtime 从旧到新删除 *.cache，直到总大小不超过 cache_size_mb。
+
+        单次 scandir 遍历，每个文件只 stat 一次；未超限时不排序。
+        """
+        entries: list[tuple[int, int, str]] = []
+        total_size = 0
+        try:
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if not entry.name.endswith(".cache"):
+                        continue
+                    try:
+                        if not entry.is_file():
+                            continue
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((st.st_mtime_ns, st.st_size, entry.path))
+                    total_size += st.st_size
+        except OSError:
+            return
 
-        total_size = sum(f.stat().st_size for f in cache_files)
         max_size = int(self.config.get("cache_size_mb", 256)) * 1024 * 1024
+        if total_size <= max_size:
+            return
 
-        while total_size > max_size and cache_files:
-            oldest = cache_files.pop(0)
-            total_size -= oldest.stat().st_size
-            try:
-                oldest.unlink()
-            except Exception:
+        entries.sort()
+        for _, size, path in entries:
+            if total_size <= max_size:
                 break
+            try:
+                os.unlink(path)
+            except OSError as e:
+                # 单个文件删除失败（被占用/权限）不影响继续清理其他文件
+                logging.debug("删除缓存文件失败 %s: %s", path, e)
+                continue
+            total_size -= size
 
     def _load_cache(self) -> None:
         try:
@@ -1127,14 +1384,24 @@ class BrainCore:
             if not cache_path.exists():
                 return
 
-            with open(cache_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            data = _json_loads(cache_path.read_bytes())
 
             if isinstance(data, dict):
                 self.result_cache.load_serializable(data)
         except Exception as e:
             logging.debug("加载磁盘缓存失败: %s", e)
 
+    def _cache_snapshot_limit(self) -> Optional[int]:
+        """落盘快照保留的最热条目数。
+
+        cache_snapshot_max_entries 未配置时取 min(1024, cache_max_entries // 8)；配置为 0 表示不限制。
+        """
+        configured = self.config.get("cache_snapshot_max_entries")
+        if configured is None:
+            return min(1024, max(1, self.result_cache.max_entries // 8))
+        configured = int(configured)
+        return configured if configured > 0 else None
+
     def _save_cache(self) -> None:
         try:
             if not self.config.get("enable_disk_cache", True):
@@ -1144,11 +1411,12 @@ class BrainCore:
 
             cache_path = Path(self.cache_dir) / "result_cache.json"
 
-            serializable = self.result_cache.snapshot_serializable()
-
             tmp_path = cache_path.with_suffix(".json.tmp")
-            with open(tmp_path, "w", encoding="utf-8") as f:
-                json.dump(serializable, f, ensure_ascii=False)
+            with open(tmp_path, "wb") as f:
+                self.result_cache.dump_json(f, limit=self._cache_snapshot_limit())
+                # 先落盘再替换，避免掉电后留下空的或截断的缓存文件
+                f.flush()
+                os.fsync(f.fileno())
             tmp_path.replace(cache_path)
         except Exception as e:
             logging.debug("保存磁盘缓存失败: %s", e)
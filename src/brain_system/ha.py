@@ -12,7 +12,6 @@ from __future__ import annotations
 import logging
 import os
 import threading
-import time
 from dataclasses import dataclass, field
 from urllib.parse import urlparse, parse_qs
 
@@ -167,14 +166,6 @@ class LeaderElector:
         """当前实例是否为 Leader。"""
         return self._is_leader
 
-    def _check_connection(self) -> bool:
-        """检查Redis连接是否健康"""
-        try:
-            self._redis.ping()
-            return True
-        except Exception:
-            return False
-
     def start(self) -> None:
         """启动 Leader 选举。"""
         if not self.cfg.enabled or self._thread is not None:
@@ -186,9 +177,7 @@ class LeaderElector:
 
             while not self._stop.is_set():
                 try:
-                    if not self._check_connection():
-                        raise ConnectionError("Redis连接不可用")
-
+                    # 不再单独 ping：acquire/extend 本身就是一次往返，连接异常会直接抛出
                     if not self._is_leader:
                         acquired = self._lock.acquire(blocking=False)
                         self._is_leader = bool(acquired)
@@ -221,7 +210,8 @@ class LeaderElector:
                             consecutive_errors
                         )
 
-                time.sleep(float(self.cfg.renew_interval_seconds))
+                # 可被 stop() 立即唤醒，无需等满一个续期间隔
+                self._stop.wait(float(self.cfg.renew_interval_seconds))
 
         self._thread = threading.Thread(target=run, daemon=True, name="LeaderElector")
         self._thread.start()
@@ -229,6 +219,9 @@ class LeaderElector:
     def stop(self) -> None:
         """停止 Leader 选举并释放锁。"""
         self._stop.set()
+        # 等待选举线程退出，避免释放锁的同时后台线程仍在续期
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=float(self.cfg.socket_timeout) + 1.0)
         try:
             if self._is_leader:
                 self._lock.release()
@@ -6,9 +6,6 @@ import threading
 import time
 from typing import Dict, Any, Optional
 
-from ..utils import optional_import
-
-psutil = optional_import("psutil")
 
 class PerformanceMonitor:
     """性能监控器，负责收集系统与Brain指标。"""
@@ -55,6 +52,9 @@ class PerformanceMonitor:
             time.sleep(self.interval)
 
     def _collect_system_metrics(self):
+        # psutil 在首次采集时才导入，不拖慢模块导入
+        from ..utils import psutil
+
         if psutil:
             self._metrics["cpu_percent"] = psutil.cpu_percent(interval=None)
             self._metrics["memory_percent"] = psutil.virtual_memory().percent
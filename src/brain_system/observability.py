@@ -4,10 +4,18 @@
 """
 from __future__ import annotations
 
-from dataclasses import dataclass
+import threading
+from dataclasses import dataclass, field
 from types import TracebackType
 from typing import Any
 
+# 任务耗时直方图分桶（秒）：覆盖亚毫秒缓存/线程任务到数秒的慢任务
+TASK_SECONDS_BUCKETS: tuple[float, ...] = (
+    0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+# 缓存命中/未命中计数累计到该值才提交一次，减少 Counter 加锁次数
+COUNTER_FLUSH_BATCH = 64
+
 
 @dataclass(slots=True)
 class Observability:
@@ -37,6 +45,61 @@ class Observability:
 
     tracer: Any = None
 
+    _task_seconds_children: dict[str, Any] = field(default_factory=dict, repr=False)
+    _task_errors_children: dict[str, Any] = field(default_factory=dict, repr=False)
+    _pending_cache_hits: int = field(default=0, repr=False)
+    _pending_cache_misses: int = field(default=0, repr=False)
+    # 调用方分布在任务线程、监控循环与 /metrics 处理线程，累加与读取清零需互斥
+    _counter_lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @staticmethod
+    def _labeled_child(metric: Any, children: dict[str, Any], task_kind: str) -> Any:
+        """返回 task_kind 对应的子指标，首次访问后缓存，跳过 labels() 的校验与加锁。"""
+        child = children.get(task_kind)
+        if child is None:
+            child = children[task_kind] = metric.labels(task_kind=task_kind)
+        return child
+
+    def observe_task_seconds(self, task_kind: str, seconds: float) -> None:
+        """记录一次任务耗时。"""
+        if self.task_seconds is not None:
+            self._labeled_child(self.task_seconds, self._task_seconds_children, task_kind).observe(seconds)
+
+    def inc_task_errors(self, task_kind: str) -> None:
+        """记录一次任务失败。"""
+        if self.task_errors is not None:
+            self._labeled_child(self.task_errors, self._task_errors_children, task_kind).inc()
+
+    def record_cache_hit(self) -> None:
+        """累计一次缓存命中，满 COUNTER_FLUSH_BATCH 次后提交。"""
+        with self._counter_lock:
+            self._pending_cache_hits += 1
+            full = self._pending_cache_hits >= COUNTER_FLUSH_BATCH
+        if full:
+            self.flush_counters()
+
+    def record_cache_miss(self) -> None:
+        """累计一次缓存未命中，满 COUNTER_FLUSH_BATCH 次后提交。"""
+        with self._counter_lock:
+            self._pending_cache_misses += 1
+            full = self._pending_cache_misses >= COUNTER_FLUSH_BATCH
+        if full:
+            self.flush_counters()
+
+    def flush_counters(self) -> None:
+        """把尚未提交的命中/未命中计数写入 Counter。
+
+        由监控循环周期调用并在关闭时调用，指标最多滞后一个监控周期或一个批次。
+        可在任意线程调用；Counter.inc 自带锁，放在本锁之外执行。
+        """
+        with self._counter_lock:
+            hits, self._pending_cache_hits = self._pending_cache_hits, 0
+            misses, self._pending_cache_misses = self._pending_cache_misses, 0
+        if hits and self.cache_hits is not None:
+            self.cache_hits.inc(hits)
+        if misses and self.cache_misses is not None:
+            self.cache_misses.inc(misses)
+
 
 def build_observability(config: dict[str, Any]) -> Observability:
     """构建可观测性实例。
@@ -59,15 +122,18 @@ def build_observability(config: dict[str, Any]) -> Observability:
         try:
             from prometheus_client import Counter, Histogram
 
+            # 标签只用有限取值的任务类别（cpu/io/other）：按 task_id 打标签会让
+            # 时间序列数随任务数无界增长（每个 task_id × 每个分桶一条）
             obs.task_seconds = Histogram(
                 "brain_task_seconds",
                 "Task execution latency in seconds",
-                labelnames=("task_id",),
+                labelnames=("task_kind",),
+                buckets=TASK_SECONDS_BUCKETS,
             )
             obs.task_errors = Counter(
                 "brain_task_errors_total",
                 "Total task failures",
-                labelnames=("task_id",),
+                labelnames=("task_kind",),
             )
             obs.cache_hits = Counter("brain_cache_hits_total", "Cache hits")
             obs.cache_misses = Counter("brain_cache_misses_total", "Cache misses")
@@ -113,6 +179,10 @@ class NullSpan:
         return False
 
 
+# NullSpan 无状态，未启用追踪时所有调用共用同一实例
+_NULL_SPAN = NullSpan()
+
+
 def start_span(obs: Observability, name: str) -> NullSpan:
     """启动一个追踪 Span。
 
@@ -127,5 +197,5 @@ def start_span(obs: Observability, name: str) -> NullSpan:
         try:
             return obs.tracer.start_as_current_span(name)
         except Exception:
-            return NullSpan()
-    return NullSpan()
+            return _NULL_SPAN
+    return _NULL_SPAN
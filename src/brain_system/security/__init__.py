@@ -14,6 +14,8 @@ import struct
 from pathlib import Path
 from typing import Any, Union
 
+from ..utils.json_codec import loads as _json_loads
+
 # Export signature utilities to be backward compatible and useful
 from .signatures import (
     SignatureVerificationError,
@@ -63,7 +65,15 @@ class SafeSerializer:
         try:
             import numpy as np
             if isinstance(obj, np.ndarray):
-                return {"__ndarray__": True, "data": obj.tolist(), "dtype": str(obj.dtype)}
+                if obj.dtype.hasobject:
+                    return {"__ndarray__": True, "data": obj.tolist(), "dtype": str(obj.dtype)}
+                # 数值数组按原始字节 base64 编码：比逐元素 tolist 转 JSON 快且体积小
+                return {
+                    "__ndarray__": True,
+                    "b64": base64.b64encode(np.ascontiguousarray(obj).tobytes()).decode("ascii"),
+                    "dtype": obj.dtype.str,
+                    "shape": list(obj.shape),
+                }
             if isinstance(obj, (np.integer, np.floating)):
                 return obj.item()
             if isinstance(obj, np.bool_):
@@ -74,8 +84,16 @@ class SafeSerializer:
 
     @staticmethod
     def _json_to_numpy(obj: Any) -> Any:
-        """从JSON还原numpy数组"""
+        """从JSON还原numpy数组（兼容旧版 data 列表格式）"""
         if isinstance(obj, dict) and obj.get("__ndarray__"):
+            if "b64" in obj:
+                raw = base64.b64decode(obj["b64"])
+                try:
+                    import numpy as np
+                except ImportError:
+                    return raw
+                # frombuffer 得到只读视图，复制一份保证结果可写
+                return np.frombuffer(raw, dtype=np.dtype(obj["dtype"])).reshape(obj["shape"]).copy()
             try:
                 import numpy as np
                 return np.array(obj["data"], dtype=obj["dtype"])
@@ -182,7 +200,7 @@ class SafeSerializer:
                 "签名验证失败：数据可能被篡改或密钥不匹配"
             )
 
-        json_data = json.loads(json_bytes.decode("utf-8"))
+        json_data = _json_loads(json_bytes)
 
         def _convert(obj: Any) -> Any:
             if isinstance(obj, dict):
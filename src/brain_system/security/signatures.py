@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import base64
 import hashlib
+import os
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Iterable, Optional
@@ -17,12 +18,22 @@ class DlcSignatureConfig:
     public_key_pem_files: tuple[str, ...] = ()
 
 
+# 不超过该大小的文件一次读入后计算摘要（DLC 源文件通常只有几十 KB）
+_SHA256_READ_ALL_MAX_BYTES = 1024 * 1024
+
+
 def _sha256_file(path: Path) -> bytes:
-    h = hashlib.sha256()
     with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size <= _SHA256_READ_ALL_MAX_BYTES:
+            return hashlib.sha256(f.read()).digest()
+        # Python 3.11+：file_digest 在 C 层循环读入并计算摘要，无需 Python 循环
+        file_digest = getattr(hashlib, "file_digest", None)
+        if file_digest is not None:
+            return file_digest(f, "sha256").digest()
+        h = hashlib.sha256()
         for chunk in iter(lambda: f.read(1024 * 1024), b""):
             h.update(chunk)
-    return h.digest()
+        return h.digest()
 
 
 def _load_sig(path: Path) -> bytes:
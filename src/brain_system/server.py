@@ -11,10 +11,17 @@ def create_app(brain: Any):
 
     try:
         from fastapi import FastAPI
-        from fastapi.responses import PlainTextResponse
+        from fastapi.responses import Response
     except Exception as e:  # pragma: no cover
         raise RuntimeError("未安装 server 依赖，安装: pip install 'brain-system[server]'") from e
 
+    # prometheus_client 可选：创建应用时解析一次，抓取时不再重复 import
+    try:
+        from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+    except Exception:
+        generate_latest = None  # type: ignore[assignment]
+        CONTENT_TYPE_LATEST = "text/plain"
+
     app = FastAPI(title="brain-system")
 
     @app.get("/health")
@@ -28,12 +35,19 @@ def create_app(brain: Any):
 
     @app.get("/metrics")
     def metrics():
+        if generate_latest is None:
+            return Response(content=b"# metrics disabled\n", media_type="text/plain")
         try:
-            from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
-
-            data = generate_latest()
-            return PlainTextResponse(content=data.decode("utf-8"), media_type=CONTENT_TYPE_LATEST)
+            # 抓取前提交批量累计的计数，导出值不滞后于监控周期
+            obs = getattr(brain, "obs", None)
+            if obs is not None and obs.metrics_enabled:
+                try:
+                    obs.flush_counters()
+                except Exception:
+                    pass
+            # generate_latest 已返回 UTF-8 bytes，直接作为响应体，省去 decode/encode 往返
+            return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
         except Exception:
-            return PlainTextResponse(content="# metrics disabled\n", media_type="text/plain")
+            return Response(content=b"# metrics disabled\n", media_type="text/plain")
 
     return app
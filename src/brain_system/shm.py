@@ -0,0 +1,113 @@
+"""进程池大数组共享内存传参模块。
+
+把参数中较大的 numpy 数组复制到 SharedMemory，只向子进程传递段名/形状/dtype，
+子进程直接映射为 ndarray，避免 pickle 序列化并经管道复制整块数据。
+调用方未使用 numpy 时所有函数退化为原样透传。
+"""
+from __future__ import annotations
+
+import logging
+import sys
+from multiprocessing import shared_memory
+from typing import Any, Callable, NamedTuple
+
+from .utils import numpy_if_loaded
+
+# 低于该字节数的数组直接随参数 pickle，共享内存的创建/映射开销不划算
+SHM_MIN_BYTES = 256 * 1024
+
+# Python 3.13+ 可关闭子进程对共享内存段的 resource_tracker 登记（段由父进程负责回收）
+_ATTACH_KWARGS: dict[str, Any] = {"track": False} if sys.version_info >= (3, 13) else {}
+
+
+class SharedArrayRef(NamedTuple):
+    """共享内存中数组的句柄（可 pickle，体积与数组大小无关）。"""
+
+    name: str
+    shape: tuple[int, ...]
+    dtype: str
+
+
+def export_shared_arrays(
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+    min_bytes: int = SHM_MIN_BYTES,
+) -> tuple[tuple[Any, ...], dict[str, Any], list[shared_memory.SharedMemory]]:
+    """把顶层参数中的大数组替换为 SharedArrayRef。
+
+    只处理 dtype 不含 Python 对象的数组；嵌套在容器中的数组保持原样。
+
+    Returns:
+        (新的 args, 新的 kwargs, 已创建的共享内存段)。调用方在任务结束后
+        必须对返回的段调用 release_shared_arrays。
+    """
+    np = numpy_if_loaded()
+    if np is None or min_bytes <= 0:
+        return args, kwargs, []
+
+    segments: list[shared_memory.SharedMemory] = []
+
+    def export(value: Any) -> Any:
+        if not isinstance(value, np.ndarray) or value.nbytes < min_bytes or value.dtype.hasobject:
+            return value
+        shm = shared_memory.SharedMemory(create=True, size=value.nbytes)
+        segments.append(shm)
+        np.ndarray(value.shape, dtype=value.dtype, buffer=shm.buf)[...] = value
+        return SharedArrayRef(shm.name, tuple(value.shape), value.dtype.str)
+
+    try:
+        new_args = tuple(export(a) for a in args)
+        new_kwargs = {k: export(v) for k, v in kwargs.items()}
+    except Exception:
+        release_shared_arrays(segments)
+        raise
+    return new_args, new_kwargs, segments
+
+
+def release_shared_arrays(segments: list[shared_memory.SharedMemory]) -> None:
+    """关闭并删除父进程创建的共享内存段。"""
+    for shm in segments:
+        try:
+            shm.close()
+            shm.unlink()
+        except Exception as e:
+            logging.debug("释放共享内存段失败 %s: %s", shm.name, e)
+
+
+def invoke_with_shared_arrays(
+    func: Callable[..., Any], args: tuple[Any, ...], kwargs: dict[str, Any]
+) -> Any:
+    """在子进程中把 SharedArrayRef 映射为 ndarray 后调用 func。
+
+    返回值若是共享内存上的视图会先复制，保证段关闭后结果仍然有效。
+    """
+    import numpy as np  # type: ignore
+
+    attached: list[shared_memory.SharedMemory] = []
+    views: list[Any] = []
+
+    def attach(value: Any) -> Any:
+        if not isinstance(value, SharedArrayRef):
+            return value
+        shm = shared_memory.SharedMemory(name=value.name, **_ATTACH_KWARGS)
+        attached.append(shm)
+        view = np.ndarray(value.shape, dtype=np.dtype(value.dtype), buffer=shm.buf)
+        views.append(view)
+        return view
+
+    try:
+        call_args = tuple(attach(a) for a in args)
+        call_kwargs = {k: attach(v) for k, v in kwargs.items()}
+        result = func(*call_args, **call_kwargs)
+        if isinstance(result, np.ndarray) and any(np.shares_memory(result, v) for v in views):
+            result = result.copy()
+        return result
+    finally:
+        # 释放对映射内存的引用后才能关闭段
+        call_args = call_kwargs = None  # type: ignore[assignment]
+        views.clear()
+        for shm in attached:
+            try:
+                shm.close()
+            except BufferError:
+                logging.debug("共享内存段仍被引用，推迟关闭: %s", shm.name)
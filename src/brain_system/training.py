@@ -1,12 +1,14 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
+import math
 import os
 import random
-import statistics
 import tempfile
 import time
-from dataclasses import dataclass
+from bisect import bisect_left
+from dataclasses import dataclass, field
 from typing import Any, Callable, Optional
 from config.constants import LAB_SAMPLE_SIZE
 
@@ -37,6 +39,54 @@ class TrainingReport:
 ProgressCallback = Callable[[str], None]
 
 
+# 延迟直方图桶上界（毫秒）：0.1ms ~ 100s 按 2^(1/3)≈1.26 倍对数分布，相对误差约 ±13%
+LATENCY_BUCKET_BOUNDS_MS: tuple[float, ...] = tuple(
+    0.1 * 2 ** (i / 3) for i in range(math.ceil(3 * math.log2(100_000 / 0.1)) + 1)
+)
+
+
+@dataclass(slots=True)
+class LatencyHistogram:
+    """固定分桶的延迟直方图：记录 O(log 桶数)，内存与样本数无关。
+
+    counts[i] 统计落在 (bounds[i-1], bounds[i]] 的样本，最后一格收纳超出上界的样本。
+    """
+
+    bounds: tuple[float, ...] = LATENCY_BUCKET_BOUNDS_MS
+    counts: list[int] = field(default_factory=list)
+    n: int = 0
+    sum: float = 0.0
+    min: float = math.inf
+    max: float = 0.0
+
+    def __post_init__(self) -> None:
+        if not self.counts:
+            self.counts = [0] * (len(self.bounds) + 1)
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.n += 1
+        self.sum += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        """按累计计数定位分位所在桶，并在桶内线性插值（结果限制在 [min, max]）。"""
+        if self.n == 0:
+            return 0.0
+        target = q * self.n
+        cum = 0
+        for i, c in enumerate(self.counts):
+            if c and cum + c >= target:
+                lo = max(self.bounds[i - 1] if i > 0 else self.min, self.min)
+                hi = min(self.bounds[i] if i < len(self.bounds) else self.max, self.max)
+                return lo + (hi - lo) * (target - cum) / c
+            cum += c
+        return self.max
+
+
 def _now() -> float:
     return time.time()
 
@@ -51,22 +101,24 @@ def _fibonacci(n: int) -> int:
 
 
 def _hash_work(data: bytes, rounds: int = 200) -> str:
-    import hashlib
-
-    h = hashlib.sha256(data).digest()
+    sha256 = hashlib.sha256  # 循环内避免重复的全局/属性查找
+    h = sha256(data).digest()
     for _ in range(rounds):
-        h = hashlib.sha256(h).digest()
+        h = sha256(h).digest()
     return h.hex()
 
 
+# 写入内容无关紧要：预生成一份随机字节复用，避免每次调用都读取内核 CSPRNG
+_IO_PAYLOAD = memoryview(os.urandom(LAB_SAMPLE_SIZE))
+
+
 def _io_work(nbytes: int) -> int:
-    # 纯本地临时文件 I/O
-    b = os.urandom(nbytes)
-    with tempfile.NamedTemporaryFile(delete=True) as f:
+    # 纯本地临时文件 I/O：无名临时文件（Linux 上为 O_TMPFILE）+ 无缓冲读写，省去建名/flush
+    b = _IO_PAYLOAD[:nbytes] if nbytes <= len(_IO_PAYLOAD) else os.urandom(nbytes)
+    with tempfile.TemporaryFile(buffering=0) as f:
         f.write(b)
-        f.flush()
         f.seek(0)
-        r = f.read()
+        r = f.read(nbytes)
     return len(r)
 
 
@@ -95,11 +147,18 @@ class BrainTrainer:
 
         progress("训练开始：压测与预热中...")
 
-        latencies: list[float] = []
+        latencies = LatencyHistogram()
         successes = 0
         failures = 0
         total = 0
 
+        # 每个任务都会用到的配置值在循环外解析一次
+        compute = brain.compute
+        include_cpu = bool(cfg.include_cpu)
+        include_io = bool(cfg.include_io)
+        cpu_task_size = int(cfg.cpu_task_size)
+        io_bytes = int(cfg.io_bytes)
+
         async def one_job(job_id: int) -> None:
             nonlocal successes, failures, total
             if cancel_event.is_set():
@@ -107,25 +166,25 @@ class BrainTrainer:
 
             # 随机混合 workload
             r = random.random()
-            task_id = f"train_{job_id}"
 
-            t0 = _now()
+            t0 = time.perf_counter()
             try:
-                if cfg.include_cpu and r < 0.5:
+                if include_cpu and r < 0.5:
                     # 用 cpu_ 前缀触发进程池策略（如果启用）
-                    await brain.compute(f"cpu_train_{job_id}", _fibonacci, int(cfg.cpu_task_size))
-                elif cfg.include_io and r < 0.8:
-                    await brain.compute(f"io_train_{job_id}", _io_work, int(cfg.io_bytes))
+                    await compute(f"cpu_train_{job_id}", _fibonacci, cpu_task_size)
+                elif include_io and r < 0.8:
+                    await compute(f"io_train_{job_id}", _io_work, io_bytes)
                 else:
-                    data = os.urandom(256)
-                    await brain.compute(task_id, _hash_work, data)
+                    # 只需互不相同（避免命中结果缓存），不需要密码学随机：不走 getrandom 系统调用
+                    data = random.randbytes(256)
+                    await compute(f"train_{job_id}", _hash_work, data)
 
                 successes += 1
             except Exception:
                 failures += 1
             finally:
                 total += 1
-                latencies.append((_now() - t0) * 1000.0)
+                latencies.observe((time.perf_counter() - t0) * 1000.0)
 
         # 可选：缓存预热（让 result_cache/磁盘 cache 更快进入稳定态）
         if cfg.include_cache_warmup:
@@ -136,20 +195,43 @@ class BrainTrainer:
             except Exception:
                 pass
 
-        # 并发压测循环
-        while _now() < deadline and not cancel_event.is_set():
-            batch = []
-            for i in range(int(cfg.concurrency)):
-                batch.append(asyncio.create_task(one_job(total + i)))
-            await asyncio.gather(*batch, return_exceptions=True)
-            progress(f"训练中：total={total} ok={successes} fail={failures}")
+        # 并发压测：固定数量的常驻 worker 从队列取任务，
+        # 不再逐批创建 Task，也不会因批内最慢的任务让其余 worker 空等
+        concurrency = max(1, int(cfg.concurrency))
+        queue: asyncio.Queue[Optional[int]] = asyncio.Queue(maxsize=concurrency * 2)
+
+        async def worker() -> None:
+            while True:
+                job_id = await queue.get()
+                if job_id is None:
+                    return
+                try:
+                    await one_job(job_id)
+                except Exception:
+                    pass
+
+        workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+        try:
+            job_id = 0
+            while _now() < deadline and not cancel_event.is_set():
+                await queue.put(job_id)
+                job_id += 1
+                if job_id % concurrency == 0:
+                    progress(f"训练中：total={total} ok={successes} fail={failures}")
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers, return_exceptions=True)
+        finally:
+            for w in workers:
+                w.cancel()
 
         ended = _now()
 
-        p50 = statistics.quantiles(latencies, n=100)[49] if len(latencies) >= 100 else (statistics.median(latencies) if latencies else 0.0)
-        p95 = statistics.quantiles(latencies, n=100)[94] if len(latencies) >= 100 else (max(latencies) if latencies else 0.0)
+        p50 = latencies.quantile(0.5)
+        # 样本不足 100 时 p95 不稳定，沿用最大值
+        p95 = latencies.quantile(0.95) if latencies.n >= 100 else (latencies.max if latencies.n else 0.0)
 
-        recommended = self.recommend_config(brain, cfg=cfg, latencies_ms=latencies)
+        recommended = self.recommend_config(brain, cfg=cfg, p95_ms=float(p95))
         progress("训练完成：已生成配置建议。")
 
         return TrainingReport(
@@ -163,7 +245,7 @@ class BrainTrainer:
             recommended_config=recommended,
         )
 
-    def recommend_config(self, brain: Any, *, cfg: TrainingConfig, latencies_ms: list[float]) -> dict[str, Any]:
+    def recommend_config(self, brain: Any, *, cfg: TrainingConfig, p95_ms: float) -> dict[str, Any]:
         """给出可落地的配置建议（不直接热改 thread/process pool，因为那涉及重建 executor）。"""
 
         out: dict[str, Any] = {}
@@ -196,10 +278,8 @@ class BrainTrainer:
                 out["cache_max_entries"] = max(min(target, cap), 10_000)
 
         # retry 建议：如果失败较多，建议提高重试次数（上限保护）
-        if latencies_ms:
-            p95 = statistics.quantiles(latencies_ms, n=100)[94] if len(latencies_ms) >= 100 else max(latencies_ms)
-            if p95 > 1500:
-                out["retry_max_attempts"] = min(int(brain.config.get("retry_max_attempts", 1)) + 1, 5)
+        if p95_ms > 1500:
+            out["retry_max_attempts"] = min(int(brain.config.get("retry_max_attempts", 1)) + 1, 5)
 
         # 训练面板建议项
         out["ui_refresh_ms"] = int(brain.config.get("ui_refresh_ms", 1000))
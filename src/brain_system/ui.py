@@ -41,7 +41,9 @@ class AsyncioLoopThread:
             return
 
         def run() -> None:
-            loop = asyncio.new_event_loop()
+            from brain_system.utils import new_event_loop
+
+            loop = new_event_loop()
             asyncio.set_event_loop(loop)
             self._loop = loop
             self._ready.set()
@@ -302,23 +304,43 @@ def run_ui(*, config_path: Optional[str] = None) -> int:
     ttk.Button(train_top, text="开始训练", command=on_train_start).pack(side=tk.RIGHT)
     ttk.Button(train_top, text="停止", command=on_train_stop).pack(side=tk.RIGHT, padx=(0, 8))
 
+    # 上次渲染的内容：未变化时跳过 Tk 调用（每次调用都要经 Tcl 往返）
+    rendered: dict[str, Any] = {"dlc": {}, "stats": None, "cache": None}
+
     def refresh_dlc() -> None:
-        for item in dlc_tree.get_children():
-            dlc_tree.delete(item)
         st = brain.get_dlc_status()
-        for name, info in sorted(st.items(), key=lambda x: x[0]):
-            dlc_tree.insert(
-                "",
-                "end",
-                values=(
-                    name,
-                    info.get("version"),
-                    info.get("type"),
-                    info.get("enabled"),
-                    info.get("initialized"),
-                    ",".join(info.get("dependencies", [])),
-                ),
+        rows = {
+            str(name): (
+                name,
+                info.get("version"),
+                info.get("type"),
+                info.get("enabled"),
+                info.get("initialized"),
+                ",".join(info.get("dependencies", [])),
             )
+            for name, info in st.items()
+        }
+        prev: dict[str, tuple[Any, ...]] = rendered["dlc"]
+        if rows == prev:
+            return
+
+        # 行 iid 即 DLC 名称：只删除/插入/更新发生变化的行
+        for name in prev.keys() - rows.keys():
+            dlc_tree.delete(name)
+        for index, name in enumerate(sorted(rows)):
+            values = rows[name]
+            if name not in prev:
+                dlc_tree.insert("", index, iid=name, values=values)
+            elif prev[name] != values:
+                dlc_tree.item(name, values=values)
+        rendered["dlc"] = rows
+
+    def _set_text(key: str, widget: Any, text: str) -> None:
+        if rendered[key] == text:
+            return
+        widget.delete("1.0", tk.END)
+        widget.insert(tk.END, text)
+        rendered[key] = text
 
     def refresh_stats() -> None:
         ps = dict(brain.performance_stats)
@@ -341,8 +363,7 @@ def run_ui(*, config_path: Optional[str] = None) -> int:
             ]
         )
 
-        stats_text.delete("1.0", tk.END)
-        stats_text.insert(tk.END, "\n".join(lines))
+        _set_text("stats", stats_text, "\n".join(lines))
 
     def refresh_cache() -> None:
         c = brain.result_cache
@@ -356,8 +377,7 @@ def run_ui(*, config_path: Optional[str] = None) -> int:
             f"evictions: {getattr(c, 'evictions', 0)}",
             f"expired: {getattr(c, 'expired', 0)}",
         ]
-        cache_text.delete("1.0", tk.END)
-        cache_text.insert(tk.END, "\n".join(lines))
+        _set_text("cache", cache_text, "\n".join(lines))
 
     def refresh_all() -> None:
         refresh_dlc()
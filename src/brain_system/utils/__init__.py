@@ -1,10 +1,15 @@
 """utils: 辅助工具集（可选导入/设备抽象/张量占位）。"""
 from __future__ import annotations
 
+import asyncio
+import functools
 import importlib
-from typing import Any, Dict, Optional
+import sys
+from typing import Any, Awaitable, Dict, Optional, TypeVar
 import logging
 
+_T = TypeVar("_T")
+
 
 class MissingOptionalDependency:
     """缺失依赖占位符，属性访问时抛出异常。"""
@@ -16,19 +21,43 @@ class MissingOptionalDependency:
         raise ImportError(f"缺少可选依赖 {self._name}，{self._hint}")
 
 
-_OPTIONAL_IMPORT_CACHE: Dict[str, Any] = {}
-
+@functools.cache
 def optional_import(module_name: str) -> Any:
-    """运行时可选导入，失败返回 None。"""
-    if module_name in _OPTIONAL_IMPORT_CACHE:
-        return _OPTIONAL_IMPORT_CACHE[module_name]
+    """运行时可选导入，失败返回 None（结果按模块名缓存，含失败结果）。"""
     try:
-        mod = importlib.import_module(module_name)
+        return importlib.import_module(module_name)
     except Exception:
-        mod = None
-    _OPTIONAL_IMPORT_CACHE[module_name] = mod
+        return None
+
+
+# 延迟解析的可选依赖：首次访问 brain_system.utils.<名称> 时才导入，缺失时为 None
+_LAZY_OPTIONAL_MODULES: Dict[str, str] = {
+    "np": "numpy",
+    "torch": "torch",
+    "cupy": "cupy",
+    "psutil": "psutil",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """PEP 562 模块属性钩子：解析结果写回模块全局，之后的访问不再经过本函数。"""
+    module_name = _LAZY_OPTIONAL_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    mod = optional_import(module_name)
+    globals()[name] = mod
     return mod
 
+
+def numpy_if_loaded() -> Any:
+    """返回已导入的 numpy 模块，未导入时返回 None。
+
+    不主动导入 numpy：调用方没有导入过 numpy 时参数里不可能有 ndarray，
+    也就无需为一次 isinstance 检查付出导入开销。
+    """
+    return sys.modules.get("numpy")
+
+
 def require_optional(mod: Any, name: str, install_hint: str) -> Any:
     """强校验：模块必须存在，否则抛出 ImportError。"""
     if mod is None:
@@ -36,6 +65,22 @@ def require_optional(mod: Any, name: str, install_hint: str) -> Any:
     return mod
 
 
+def new_event_loop() -> asyncio.AbstractEventLoop:
+    """新建事件循环：已安装 uvloop（pip install 'brain-system[perf]'）时使用 uvloop。"""
+    uvloop = optional_import("uvloop")
+    if uvloop is not None:
+        return uvloop.new_event_loop()
+    return asyncio.new_event_loop()
+
+
+def run_async(main: Awaitable[_T]) -> _T:
+    """asyncio.run 的替代：Python 3.11+ 通过 asyncio.Runner 使用 new_event_loop 创建的循环。"""
+    if sys.version_info >= (3, 11):
+        with asyncio.Runner(loop_factory=new_event_loop) as runner:
+            return runner.run(main)
+    return asyncio.run(main)  # type: ignore[arg-type]
+
+
 class Device:
     """设备抽象基类。"""
     def __init__(self, device_id: str):
@@ -68,14 +113,22 @@ class CPUDevice(Device):
 
 class Tensor:
     """简易张量抽象，实际数据由后端管理。"""
+    __slots__ = ("data", "device", "shape")
+
     def __init__(self, data: Any, device: Device):
         self.data = data
         self.device = device
-        self.shape = self._get_shape(data)
-
-    def _get_shape(self, data: Any) -> tuple:
-        if hasattr(data, "shape"):
-            return tuple(data.shape)
-        if isinstance(data, (list, tuple)):
-            return (len(data),)
-        return ()
+        # 按精确类型分派，常见的 list/tuple 无需反射；其余对象取 shape 属性
+        if type(data) in _SEQUENCE_TYPES:
+            self.shape = (len(data),)
+        else:
+            shape = getattr(data, "shape", None)
+            if shape is not None:
+                self.shape = tuple(shape)
+            elif isinstance(data, (list, tuple)):
+                self.shape = (len(data),)
+            else:
+                self.shape = ()
+
+
+_SEQUENCE_TYPES = frozenset({list, tuple})
@@ -0,0 +1,85 @@
+"""JSON 编解码：优先 orjson（pip install 'brain-system[config]'），结果始终与标准库一致。
+
+orjson 与标准库的差异：
+- 不接受/不输出 NaN、Infinity（输出时静默写成 null），不支持超出 64 位的整数；
+- 会序列化标准库拒绝的类型（dataclass、datetime/date/time、UUID、Enum），
+  并把 str/int/dict 等的子类按基类写出。
+统一规则：解码时 orjson 报错则改用标准库；编码时只把由内置基本类型组成的对象交给
+orjson，其余对象以及 orjson 报错或可能丢失值的结果都改用标准库，标准库拒绝的照样抛错。
+"""
+from __future__ import annotations
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson as _orjson  # type: ignore
+except Exception:  # pragma: no cover - 取决于环境
+    _orjson = None
+
+
+# 交给 orjson 的对象只能由这些精确类型组成（子类交给标准库，保证与标准库同语义）
+_SCALAR_TYPES = frozenset((str, int, float, bool, type(None)))
+_is_scalar_type = _SCALAR_TYPES.__contains__
+# orjson 的嵌套深度上限为 254；更深的对象（含循环引用）交给标准库处理/报错
+_MAX_DEPTH = 254
+
+
+def _is_plain(obj: Any) -> bool:
+    """obj 是否只由内置 JSON 类型（不含子类）组成，字典键为标量。
+
+    迭代遍历；只含标量的容器用 all(map(...)) 一次判定，不逐个入栈。
+    """
+    if type(obj) in _SCALAR_TYPES:
+        return True
+    stack = [(obj, 0)]
+    pop, push = stack.pop, stack.append
+    while stack:
+        node, depth = pop()
+        tp = type(node)
+        if tp is dict:
+            if not all(map(_is_scalar_type, map(type, node))):
+                return False
+            values = node.values()
+        elif tp is list or tp is tuple:
+            values = node
+        else:
+            return False
+        if all(map(_is_scalar_type, map(type, values))):
+            continue
+        if depth >= _MAX_DEPTH:
+            return False
+        for v in values:
+            if type(v) not in _SCALAR_TYPES:
+                push((v, depth + 1))
+    return True
+
+
+def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+    """解析 JSON；orjson 拒绝的输入（NaN/Infinity/大整数）回退到标准库。"""
+    if _orjson is not None:
+        try:
+            return _orjson.loads(data)
+        except _orjson.JSONDecodeError:
+            pass
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        data = bytes(data).decode("utf-8")
+    return json.loads(data)
+
+
+def dumps(obj: Any) -> bytes:
+    """序列化为 UTF-8 编码的紧凑 JSON；非字符串键按标准库规则转为字符串。
+
+    只有由内置基本类型组成的对象才用 orjson；orjson 输出中出现 null 时可能是被替换的
+    NaN/Infinity，此时交给标准库重新序列化。标准库不可序列化的对象
+    （如 dataclass、datetime、UUID、Enum）抛出 TypeError/ValueError。
+    """
+    if _orjson is not None and _is_plain(obj):
+        try:
+            encoded = _orjson.dumps(obj, option=_orjson.OPT_NON_STR_KEYS)
+        except _orjson.JSONEncodeError:
+            pass
+        else:
+            if b"null" not in encoded:
+                return encoded
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
@@ -0,0 +1,72 @@
+"""后台预取迭代器：在独立线程中提前取出下一批数据，使数据加载与计算重叠。"""
+from __future__ import annotations
+
+import queue
+import threading
+from typing import Any, Generic, Iterable, Iterator, TypeVar
+
+_T = TypeVar("_T")
+
+# 生产者结束标记（不用 None，None 可能是合法元素）
+_END = object()
+
+
+class _Failure:
+    """包装生产者线程中抛出的异常，交由消费者线程重新抛出。"""
+
+    __slots__ = ("exc",)
+
+    def __init__(self, exc: BaseException):
+        self.exc = exc
+
+
+class Prefetcher(Generic[_T]):
+    """用有界队列在后台线程中预取 iterable 的元素。
+
+    每次迭代启动一个新的生产者线程；最多领先消费者 depth 个元素。
+    生产者中的异常会在消费者取到对应位置时原样抛出。消费者提前结束
+    （break/异常）时生产者会在下一次入队前退出。
+    """
+
+    def __init__(self, iterable: Iterable[_T], depth: int = 2):
+        self._iterable = iterable
+        self._depth = max(1, int(depth))
+
+    def __iter__(self) -> Iterator[_T]:
+        q: queue.Queue[Any] = queue.Queue(maxsize=self._depth)
+        stop = threading.Event()
+        thread = threading.Thread(
+            target=self._produce, args=(q, stop), name="Prefetcher", daemon=True
+        )
+        thread.start()
+        try:
+            while True:
+                item = q.get()
+                if item is _END:
+                    return
+                if type(item) is _Failure:
+                    raise item.exc
+                yield item
+        finally:
+            stop.set()
+
+    def _produce(self, q: queue.Queue[Any], stop: threading.Event) -> None:
+        try:
+            for item in self._iterable:
+                if not self._put(q, stop, item):
+                    return
+        except BaseException as e:
+            self._put(q, stop, _Failure(e))
+            return
+        self._put(q, stop, _END)
+
+    @staticmethod
+    def _put(q: queue.Queue[Any], stop: threading.Event, item: Any) -> bool:
+        """阻塞入队，消费者已停止时放弃并返回 False。"""
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
@@ -8,7 +8,7 @@ from __future__ import annotations
 import json
 import logging
 import os
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 
 from typing import Any
 
@@ -21,6 +21,14 @@ logger = logging.getLogger(__name__)
 # ============================================================
 MAX_CONFIG_SIZE = 1024 * 1024  # 1MB config file size limit
 
+# Integer settings that must be positive, with the default used when invalid
+_POSITIVE_INT_FIELDS: tuple[tuple[str, int], ...] = (
+    ("scroll_sensitivity", DEFAULT_SCROLL_SENSITIVITY),
+    ("highlight_size_limit", HIGHLIGHT_SIZE_LIMIT),
+    ("max_history_items", 100),
+    ("auto_save_interval", 300),
+)
+
 
 @dataclass
 class AppConfig:
@@ -41,37 +49,17 @@ class AppConfig:
     auto_save_interval: int = 300
     theme: str = "light"
     enable_smart_learning: bool = True
-    _mtime: float = field(default=0.0, repr=False)
+    _mtime: int = field(default=0, repr=False)  # st_mtime_ns of the last loaded/saved file
+    _saved_payload: bytes = field(default=b"", repr=False)  # bytes written by the last save()
     
     def _validate(self) -> None:
         """Validate and fix configuration values."""
-        try:
-            self.scroll_sensitivity = int(self.scroll_sensitivity)
-        except Exception:
-            self.scroll_sensitivity = DEFAULT_SCROLL_SENSITIVITY
-        if self.scroll_sensitivity <= 0:
-            self.scroll_sensitivity = DEFAULT_SCROLL_SENSITIVITY
-        
-        try:
-            self.highlight_size_limit = int(self.highlight_size_limit)
-        except Exception:
-            self.highlight_size_limit = HIGHLIGHT_SIZE_LIMIT
-        if self.highlight_size_limit <= 0:
-            self.highlight_size_limit = HIGHLIGHT_SIZE_LIMIT
-        
-        try:
-            self.max_history_items = int(self.max_history_items)
-        except Exception:
-            self.max_history_items = 100
-        if self.max_history_items <= 0:
-            self.max_history_items = 100
-        
-        try:
-            self.auto_save_interval = int(self.auto_save_interval)
-        except Exception:
-            self.auto_save_interval = 300
-        if self.auto_save_interval <= 0:
-            self.auto_save_interval = 300
+        for name, default in _POSITIVE_INT_FIELDS:
+            try:
+                value = int(getattr(self, name))
+            except Exception:
+                value = default
+            setattr(self, name, value if value > 0 else default)
         
         if not isinstance(self.theme, str) or not self.theme:
             self.theme = "light"
@@ -148,7 +136,7 @@ class AppConfig:
                 )
                 
                 try:
-                    cfg._mtime = os.path.getmtime(config_file)
+                    cfg._mtime = os.stat(config_file).st_mtime_ns
                 except Exception:
                     pass
                     
@@ -161,6 +149,9 @@ class AppConfig:
     def save(self, config_file: str) -> None:
         """Save configuration to file.
         
+        The file is replaced atomically. Nothing is written when the serialized
+        configuration equals the last save and the file has not changed since.
+        
         Args:
             config_file: Configuration file path.
         """
@@ -172,27 +163,58 @@ class AppConfig:
             "theme": self.theme,
             "enable_smart_learning": self.enable_smart_learning,
         }
-        with open(config_file, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        payload = json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+        
+        # Skip the write when nothing changed since our last save and the file is untouched
+        if payload == self._saved_payload:
+            try:
+                if os.stat(config_file).st_mtime_ns == self._mtime:
+                    return
+            except OSError:
+                pass
+        
+        # Write to a sibling temp file and rename, so readers never see a partial file
+        tmp_file = f"{config_file}.tmp"
+        try:
+            with open(tmp_file, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_file, config_file)
+        except BaseException:
+            try:
+                os.unlink(tmp_file)
+            except OSError:
+                pass
+            raise
+        self._saved_payload = payload
         
         try:
-            self._mtime = os.path.getmtime(config_file)
+            self._mtime = os.stat(config_file).st_mtime_ns
         except Exception:
             pass
     
     def reload_if_changed(self, config_file: str) -> AppConfig:
         """Reload configuration if file has changed.
         
+        A single os.stat() gates the reload: the file is only opened and parsed
+        when its st_mtime_ns differs from the last load/save (any change, not
+        just a newer timestamp). Values are updated in place, so every holder
+        of this instance sees the new configuration.
+        
         Args:
             config_file: Configuration file path.
             
         Returns:
-            Current or reloaded configuration.
+            This configuration object.
         """
         try:
-            mtime = os.path.getmtime(config_file)
-            if mtime > self._mtime:
-                return self.load(config_file)
-        except Exception:
-            pass
+            mtime = os.stat(config_file).st_mtime_ns
+        except OSError:
+            return self
+        if mtime == self._mtime:
+            return self
+        fresh = self.load(config_file)
+        for f in fields(self):
+            setattr(self, f.name, getattr(fresh, f.name))
+        # Record the stat result even if parsing failed, so a broken file is not re-parsed on every poll
+        self._mtime = mtime
         return self
@@ -143,35 +143,39 @@ os.makedirs(LAB_RUNS_DIR, exist_ok=True)
 # ============================================================
 # 预编译正则表达式 - Precompiled Regex Patterns
 # ============================================================
+# 崩溃日志中的模组 ID/版本号均为 ASCII；re.ASCII 让 \w/\s 与忽略大小写走 ASCII 快速路径
 
 RE_JAR_NAME_VER: Final[re.Pattern[str]] = re.compile(
-    r"([A-Za-z0-9_.\-]+)-([0-9][A-Za-z0-9\.\-_]+)\.jar"
+    r"([A-Za-z0-9_.\-]+)-([0-9][A-Za-z0-9\.\-_]+)\.jar",
+    flags=re.ASCII,
 )
 RE_NAME_MODID_VER: Final[re.Pattern[str]] = re.compile(
-    r"([^\n\r()]{2,60})\(([\w\-\_]+)\)\s*v?([0-9A-Za-z\.\-\+_]+)"
+    r"([^\n\r()]{2,60})\(([\w\-\_]+)\)\s*v?([0-9A-Za-z\.\-\+_]+)",
+    flags=re.ASCII,
 )
 RE_MODID_AT_VER: Final[re.Pattern[str]] = re.compile(
-    r"([A-Za-z0-9_.\-]+)@([0-9A-Za-z\.\-\+_]+)"
+    r"([A-Za-z0-9_.\-]+)@([0-9A-Za-z\.\-\+_]+)",
+    flags=re.ASCII,
 )
 RE_CTX_DEP: Final[re.Pattern[str]] = re.compile(
     r"(?:requires|required|is missing|missing)\s+[:'\"]*\s*([A-Za-z0-9_.\-]+)",
-    flags=re.IGNORECASE,
+    flags=re.IGNORECASE | re.ASCII,
 )
 RE_MOD_FALLBACK: Final[re.Pattern[str]] = re.compile(
     r"mod\s+['\"]?([A-Za-z0-9_.\-]+)['\"]?",
-    flags=re.IGNORECASE
+    flags=re.IGNORECASE | re.ASCII,
 )
 RE_DEP_REQUESTED: Final[re.Pattern[str]] = re.compile(
     r"Mod ID:\s*'([^']+)'\s*,\s*Requested by:\s*'([^']+)'",
-    flags=re.IGNORECASE,
+    flags=re.IGNORECASE | re.ASCII,
 )
 RE_DEP_REQUIRES: Final[re.Pattern[str]] = re.compile(
     r"([A-Za-z0-9_.\-]+)\s+(?:requires|required|depends on|depends)\s+([A-Za-z0-9_.\-]+)",
-    flags=re.IGNORECASE,
+    flags=re.IGNORECASE | re.ASCII,
 )
 RE_REQUESTED_BY: Final[re.Pattern[str]] = re.compile(
     r"Requested by:\s*([^,\n\r]+)",
-    flags=re.IGNORECASE
+    flags=re.IGNORECASE | re.ASCII,
 )
 
 
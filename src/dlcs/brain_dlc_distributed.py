@@ -2,13 +2,22 @@
 from __future__ import annotations
 
 import logging
-import threading
-import queue
-from typing import Any, Dict, List, Optional
-import math
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from functools import partial
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 from brain_system import BrainCore, BrainDLC, BrainDLCType, DLCManifest
 
+
+def _call_item(func, item) -> Tuple[bool, Any]:
+    """在 worker 中执行单项，把异常作为结果返回，避免中断整个 map。"""
+    try:
+        return True, func(item)
+    except Exception as e:
+        return False, e
+
+
 class DistributedComputingDLC(BrainDLC):
     def get_manifest(self) -> DLCManifest:
         return DLCManifest(
@@ -22,9 +31,9 @@ class DistributedComputingDLC(BrainDLC):
         )
 
     def _initialize(self):
-        self.workers: List[threading.Thread] = []
-        self.task_queue = queue.Queue()
-        self.result_queue = queue.Queue()
+        self._num_workers = 2
+        self._thread_pool: Optional[ThreadPoolExecutor] = None
+        self._process_pool: Optional[ProcessPoolExecutor] = None
         self.is_running = False
         logging.info("DistributedComputingDLC 初始化")
 
@@ -42,73 +51,82 @@ class DistributedComputingDLC(BrainDLC):
     def start_workers(self, num_workers: int = 2):
         if self.is_running:
             return
-        
+
+        self._num_workers = max(1, int(num_workers))
         self.is_running = True
-        for i in range(num_workers):
-            t = threading.Thread(target=self._worker_loop, args=(i,), daemon=True)
-            t.start()
-            self.workers.append(t)
-        logging.info(f"启动了 {num_workers} 个 Worker 线程")
+        logging.info(f"启动了 {self._num_workers} 个 Worker")
 
     def stop_workers(self):
         self.is_running = False
-        # 发送毒丸
-        for _ in self.workers:
-            self.task_queue.put(None)
-        
-        for t in self.workers:
-            if t.is_alive():
-                t.join(timeout=0.5)
-        self.workers.clear()
-
-    def parallel_map(self, func, data_list: List[Any]) -> List[Any]:
-        """类似 Pool.map 的并行执行。"""
+        for pool in (self._thread_pool, self._process_pool):
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+        self._thread_pool = None
+        self._process_pool = None
+
+    def _get_pool(self, executor: str) -> Executor:
+        """按需创建执行器；process 用于可 pickle 的 CPU 密集函数，thread 适合 IO/任意可调用对象。"""
+        if executor == "process":
+            if self._process_pool is None:
+                self._process_pool = ProcessPoolExecutor(max_workers=self._num_workers)
+            return self._process_pool
+        if executor != "thread":
+            raise ValueError(f"未知的执行器类型: {executor}")
+        if self._thread_pool is None:
+            self._thread_pool = ThreadPoolExecutor(
+                max_workers=self._num_workers, thread_name_prefix="DistWorker"
+            )
+        return self._thread_pool
+
+    def parallel_map(
+        self,
+        func,
+        data_list: List[Any],
+        *,
+        executor: str = "thread",
+        timeout: Optional[float] = 30.0,
+    ) -> List[Any]:
+        """类似 Pool.map 的并行执行。
+
+        executor="process" 时 func 与数据需可 pickle，按块分发以摊薄进程间通信开销。
+        单项失败只记录日志并在对应位置返回 None；超时返回已完成的部分结果。
+        timeout 默认 30 秒，显式传入 None 表示不限时等待。
+        """
         if not self.is_running:
             self.start_workers(2)
 
         total = len(data_list)
-        results = [None] * total
-        
-        # 任务分发
-        for idx, item in enumerate(data_list):
-            self.task_queue.put((func, item, idx))
-
-        # 收集结果
-        completed = 0
-        while completed < total:
-            try:
-                # 阻塞直到有结果
-                res = self.result_queue.get(timeout=30.0)
-                if isinstance(res, Exception):
-                     logging.error(f"Worker exception: {res}")
+        results: List[Any] = [None] * total
+        if total == 0:
+            return results
+
+        pool = self._get_pool(executor)
+        chunksize = max(1, total // (4 * self._num_workers))
+        outcomes = pool.map(partial(_call_item, func), data_list, timeout=timeout, chunksize=chunksize)
+        try:
+            for idx, (ok, value) in enumerate(outcomes):
+                if ok:
+                    results[idx] = value
                 else:
-                    r_item, r_idx = res
-                    results[r_idx] = r_item
-                completed += 1
-            except queue.Empty:
-                logging.warning("并行任务超时")
-                break
-        
+                    logging.error(f"Worker exception: {value}")
+        except FuturesTimeoutError:
+            logging.warning("并行任务超时")
+
         return results
 
-    def partition_data(self, data: List[Any], num_partitions: int) -> List[List[Any]]:
-        """简单的由 Host 执行的数据切分。"""
-        chunk_size = math.ceil(len(data) / num_partitions)
-        return [data[i : i + chunk_size] for i in range(0, len(data), chunk_size)]
+    def partition_data(self, data: Sequence[Any], num_partitions: int) -> List[Sequence[Any]]:
+        """简单的由 Host 执行的数据切分。
 
-    def _worker_loop(self, worker_id: int):
-        while self.is_running:
-            try:
-                task = self.task_queue.get(timeout=1.0)
-            except queue.Empty:
-                continue
-            
-            if task is None: # Poison pill
-                break
-            
-            func, item, idx = task
-            try:
-                res = func(item)
-                self.result_queue.put((res, idx))
-            except Exception as e:
-                self.result_queue.put(e)
+        ndarray 切片本身就是视图；bytes/bytearray 经 memoryview 切分，同样不复制数据。
+        视图与原数据共享内存，原数据被修改时分片随之变化。list 等其他序列按切片返回副本。
+        空数据返回空列表；num_partitions 必须为正整数，否则抛出 ValueError。
+        """
+        if num_partitions <= 0:
+            raise ValueError(f"num_partitions 必须为正整数: {num_partitions}")
+        if isinstance(data, (bytes, bytearray)):
+            data = memoryview(data)
+        # 整数向上取整，避免浮点除法
+        chunk_size = -(-len(data) // num_partitions)
+        if chunk_size == 0:
+            return []
+        return [data[i : i + chunk_size] for i in range(0, len(data), chunk_size)]
@@ -3,11 +3,39 @@ from __future__ import annotations
 
 import logging
 import time
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 from pathlib import Path
 
 from brain_system import BrainCore, BrainDLC, BrainDLCType, DLCManifest
 from brain_system.security import SafeSerializer
+from brain_system.utils import numpy_if_loaded
+from brain_system.utils.prefetch import Prefetcher
+
+
+_MISSING = object()
+
+
+def _squared_error(pred: Any, target: Any) -> Any:
+    """未提供 loss 时的回退实现 (Squared Error)，依赖 TensorNode 重载了 __sub__ 和 __mul__。"""
+    diff = pred - target
+    return diff * diff
+
+
+def _to_float(d: Any) -> float:
+    try:
+        return float(d)
+    except Exception:
+        return 0.0
+
+
+def _float_converter(d: Any) -> Callable[[Any], float]:
+    """按 loss.data 的类型选择转 float 的方式 (兼容 numpy/cupy)。"""
+    if hasattr(d, "item"):
+        return lambda v: float(v.item())
+    if hasattr(d, "sum"):
+        return lambda v: float(v.sum())
+    return _to_float
+
 
 class NeuralWorkflowDLC(BrainDLC):
     def get_manifest(self) -> DLCManifest:
@@ -39,8 +67,20 @@ class NeuralWorkflowDLC(BrainDLC):
             "load_checkpoint": self.load_checkpoint,
         }
 
-    def train_loop(self, model: Any, data_loader: Any, epochs: int = 1, lr: float = 0.01, loss_fn: Optional[Any] = None) -> Dict[str, Any]:
-        """训练循环 (基于 Duck Type Autograd)。"""
+    def train_loop(
+        self,
+        model: Any,
+        data_loader: Any,
+        epochs: int = 1,
+        lr: float = 0.01,
+        loss_fn: Optional[Any] = None,
+        prefetch: int = 0,
+    ) -> Dict[str, Any]:
+        """训练循环 (基于 Duck Type Autograd)。
+
+        prefetch > 0 时在后台线程中预取最多 prefetch 个 batch，使数据加载与前向/反向重叠；
+        data_loader 需可在其他线程中迭代。
+        """
         if not hasattr(model, "parameters") or not hasattr(model, "zero_grad"):
             logging.warning("模型必须具备 parameters() 和 zero_grad() 方法")
             return {"status": "failed", "reason": "invalid_model"}
@@ -57,6 +97,23 @@ class NeuralWorkflowDLC(BrainDLC):
             except Exception:
                 pass
 
+        # 每个参数复用一块缓冲存放 lr*grad，避免每步为每个参数分配临时数组
+        scratch: Dict[int, Any] = {}
+
+        # 循环不变量提前绑定：每个 batch 不再重复属性查找/hasattr 判断
+        zero_grad = model.zero_grad
+        parameters = model.parameters
+        sgd_step = self._sgd_step
+        if loss_fn:
+            compute_loss = loss_fn
+        elif hasattr(model, "compute_loss"):
+            compute_loss = model.compute_loss
+        else:
+            compute_loss = _squared_error
+        # loss.data -> float 的转换方式按类型解析一次后复用
+        value_type: Optional[type] = None
+        to_float: Callable[[Any], float] = _to_float
+
         for epoch in range(epochs):
             total_loss = 0.0
             steps = 0
@@ -65,48 +122,32 @@ class NeuralWorkflowDLC(BrainDLC):
             if hasattr(model, "train"):
                 model.train()
 
-            for batch_x, batch_y in data_loader:
+            batches = Prefetcher(data_loader, depth=prefetch) if prefetch > 0 else data_loader
+            for batch_x, batch_y in batches:
                 # 1. 清空梯度
-                model.zero_grad()
+                zero_grad()
                 
                 # 2. 前向
                 pred = model(batch_x)
                 
                 # 3. 计算 Loss
-                if loss_fn:
-                    loss = loss_fn(pred, batch_y)
-                elif hasattr(model, "compute_loss"):
-                    loss = model.compute_loss(pred, batch_y)
-                else:
-                    # Fallback tricky implementation (Squared Error)
-                    # 依赖 TensorNode 重载了 __sub__ 和 __mul__
-                    diff = pred - batch_y
-                    loss = diff * diff 
+                loss = compute_loss(pred, batch_y)
 
                 # 4. 反向
-                if hasattr(loss, "backward"):
-                    loss.backward()
+                backward = getattr(loss, "backward", None)
+                if backward is not None:
+                    backward()
                     
                 # 5. 更新参数 (SGD)
-                for param in model.parameters():
-                    if param.grad is not None:
-                        param.data -= lr * param.grad
+                sgd_step(parameters(), lr, scratch)
                 
                 # 记录
-                loss_val = 0.0
-                if hasattr(loss, "data"):
-                    # 尝试转 float (兼容 numpy/cupy)
-                    d = loss.data
-                    if hasattr(d, "item"):
-                        loss_val = float(d.item())
-                    elif hasattr(d, "sum"):
-                         loss_val = float(d.sum())
-                    else:
-                        try:
-                            loss_val = float(d)
-                        except:
-                            loss_val = 0.0
-                total_loss += loss_val
+                d = getattr(loss, "data", _MISSING)
+                if d is not _MISSING:
+                    if type(d) is not value_type:
+                        value_type = type(d)
+                        to_float = _float_converter(d)
+                    total_loss += to_float(d)
                 steps += 1
             
             avg_loss = total_loss / max(steps, 1)
@@ -120,6 +161,33 @@ class NeuralWorkflowDLC(BrainDLC):
             "duration": time.time() - start_time
         }
 
+    @staticmethod
+    def _sgd_step(params: Any, lr: float, scratch: Dict[int, Any]) -> None:
+        """param.data -= lr * param.grad；numpy 浮点参数走原地 ufunc，不产生临时数组。
+
+        grad 可能与上游梯度共享内存，因此缩放结果写入 scratch 缓冲而不是原地改写 grad。
+        """
+        np = numpy_if_loaded()
+        for param in params:
+            grad = param.grad
+            if grad is None:
+                continue
+            data = param.data
+            if (
+                np is not None
+                and type(data) is np.ndarray
+                and type(grad) is np.ndarray
+                and data.shape == grad.shape
+                and data.dtype.kind in "fc"
+            ):
+                buf = scratch.get(id(param))
+                if buf is None or buf.shape != data.shape or buf.dtype != data.dtype:
+                    buf = scratch[id(param)] = np.empty_like(data)
+                np.multiply(grad, lr, out=buf, casting="same_kind")
+                np.subtract(data, buf, out=data)
+            else:
+                param.data -= lr * grad
+
     def inference(self, model: Any, x: Any) -> Any:
         if hasattr(model, "eval"):
             model.eval()
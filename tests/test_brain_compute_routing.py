@@ -1,5 +1,17 @@
+import asyncio
 import json
+import logging
+import math
+import multiprocessing
+import os
+import sys
+import threading
+import time
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import pytest
 
 from brain_system.core import BrainCore
 
@@ -65,3 +77,275 @@ def test_latency_strategy_prefers_thread(tmp_path: Path) -> None:
         assert kind == "thread"
     finally:
         _shutdown_brain(brain)
+
+
+def test_cache_key_ignores_kwargs_order_and_separates_args(tmp_path: Path) -> None:
+    brain = _make_brain(tmp_path, {})
+    try:
+        def f(*args, **kwargs):
+            return None
+
+        k1 = brain._generate_cache_key(f, 1, a=1, b=2)
+        assert k1 == brain._generate_cache_key(f, 1, b=2, a=1)
+        assert k1 != brain._generate_cache_key(f, 2, a=1, b=2)
+        assert len(k1) == 32
+    finally:
+        _shutdown_brain(brain)
+
+
+def test_cache_key_separates_same_named_functions(tmp_path: Path) -> None:
+    brain = _make_brain(tmp_path, {})
+    try:
+        class A:
+            @staticmethod
+            def run(x):
+                return x
+
+        class B:
+            @staticmethod
+            def run(x):
+                return -x
+
+        assert A.run.__name__ == B.run.__name__
+        assert brain._generate_cache_key(A.run, 1) != brain._generate_cache_key(B.run, 1)
+        assert brain._generate_cache_key(A.run, 1) == brain._generate_cache_key(A.run, 1)
+    finally:
+        _shutdown_brain(brain)
+
+
+def test_result_cache_is_sharded_by_config(tmp_path: Path) -> None:
+    brain = _make_brain(tmp_path, {"cache_shards": 3, "cache_max_entries": 1000})
+    try:
+        assert brain.result_cache.shard_count == 4
+        brain.result_cache.set("k", 1)
+        assert brain.result_cache.get("k") == 1
+        assert brain.result_cache.get_stats()["max_entries"] == 1000
+    finally:
+        _shutdown_brain(brain)
+
+
+def test_result_cache_shards_are_clamped_to_capacity(tmp_path: Path) -> None:
+    # 10 条容量配 64 个分片时，哈希不均会让条目在总量未满时被淘汰
+    brain = _make_brain(tmp_path, {"cache_shards": 64, "cache_max_entries": 10})
+    try:
+        assert brain.result_cache.shard_count == 1
+        for i in range(10):
+            brain.result_cache.set(f"k{i}", i)
+        assert all(brain.result_cache.get(f"k{i}") == i for i in range(10))
+    finally:
+        _shutdown_brain(brain)
+
+    # 上限向下取整为 2 的幂：1000 // 64 = 15 -> 8 个分片，每分片 125 条
+    brain = _make_brain(tmp_path, {"cache_shards": 64, "cache_max_entries": 1000})
+    try:
+        assert brain.result_cache.shard_count == 8
+    finally:
+        _shutdown_brain(brain)
+
+
+def test_process_pool_uses_configured_start_method(tmp_path: Path) -> None:
+    brain = _make_brain(
+        tmp_path,
+        {"process_pool_start_method": "spawn", "process_pool_max_tasks_per_child": 5},
+    )
+    try:
+        assert brain.process_pool is not None
+        assert brain.process_pool._mp_context.get_start_method() == "spawn"
+        if sys.version_info >= (3, 11):
+            assert brain.process_pool._max_tasks_per_child == 5
+    finally:
+        _shutdown_brain(brain)
+
+
+def test_process_pool_falls_back_on_unsupported_start_method(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+) -> None:
+    import brain_system.core as core_mod
+
+    monkeypatch.setattr(core_mod.multiprocessing, "get_all_start_methods", lambda: ["spawn"])
+    with caplog.at_level(logging.WARNING):
+        brain = _make_brain(
+            tmp_path,
+            # max_tasks_per_child 会让执行器在未指定上下文时改用 spawn，这里关闭以比较默认方式
+            {"process_pool_start_method": "forkserver", "process_pool_max_tasks_per_child": 0},
+        )
+    try:
+        assert brain.process_pool is not None
+        default_method = multiprocessing.get_context().get_start_method()
+        assert brain.process_pool._mp_context.get_start_method() == default_method != "forkserver"
+        assert any("forkserver" in r.getMessage() for r in caplog.records if r.levelno == logging.WARNING)
+    finally:
+        _shutdown_brain(brain)
+
+
+def test_to_thread_uses_brain_thread_pool_across_loops(tmp_path: Path) -> None:
+    brain = _make_brain(tmp_path, {"process_pool_size": 0})
+    try:
+        async def task() -> str:
+            return await asyncio.to_thread(lambda: threading.current_thread().name)
+
+        # asyncio.run 结束时关闭默认执行器，不应影响 BrainCore 的线程池
+        for i in range(2):
+            name = asyncio.run(brain.compute(f"io_thread_name_{i}", task))
+            assert name.startswith("BrainWorker")
+        assert not brain.thread_pool._shutdown
+    finally:
+        _shutdown_brain(brain)
+
+
+def test_disk_cache_snapshot_roundtrip(tmp_path: Path) -> None:
+    brain = _make_brain(tmp_path, {"process_pool_size": 0})
+    try:
+        brain.config["enable_disk_cache"] = True
+        brain.cache_dir = tmp_path
+        brain.result_cache.set("k1", {"v": [1, 2]})
+        brain.result_cache.set("k2", "text")
+        # orjson 不接受的值：加载时需回退到标准库，不能丢弃整个快照
+        brain.result_cache.set("k3", [math.nan, math.inf, 2**70])
+        brain._save_cache()
+        assert not (tmp_path / "result_cache.json.tmp").exists()
+
+        brain.result_cache.clear()
+        brain._load_cache()
+        assert brain.result_cache.get("k1") == {"v": [1, 2]}
+        assert brain.result_cache.get("k2") == "text"
+        nan, inf, big = brain.result_cache.get("k3")
+        assert math.isnan(nan) and inf == math.inf and big == 2**70
+    finally:
+        _shutdown_brain(brain)
+
+
+def test_cleanup_old_cache_removes_oldest_files_over_limit(tmp_path: Path) -> None:
+    brain = _make_brain(tmp_path, {"process_pool_size": 0, "cache_size_mb": 1})
+    try:
+        brain.cache_dir = tmp_path
+        for i in range(3):
+            f = tmp_path / f"{i}.cache"
+            f.write_bytes(b"x" * 400 * 1024)
+            os.utime(f, ns=(i * 10**9, i * 10**9))
+        (tmp_path / "keep.txt").write_bytes(b"x" * 2 * 1024 * 1024)
+
+        brain._cleanup_old_cache()
+        assert sorted(p.name for p in tmp_path.glob("*.cache")) == ["1.cache", "2.cache"]
+        assert (tmp_path / "keep.txt").exists()
+    finally:
+        _shutdown_brain(brain)
+
+
+def test_cleanup_old_cache_skips_files_it_cannot_delete(tmp_path: Path, monkeypatch) -> None:
+    brain = _make_brain(tmp_path, {"process_pool_size": 0, "cache_size_mb": 1})
+    try:
+        brain.cache_dir = tmp_path
+        for i in range(3):
+            f = tmp_path / f"{i}.cache"
+            f.write_bytes(b"x" * 400 * 1024)
+            os.utime(f, ns=(i * 10**9, i * 10**9))
+
+        real_unlink = os.unlink
+
+        def flaky_unlink(path, *a, **kw):
+            if str(path).endswith("0.cache"):
+                raise PermissionError(path)
+            return real_unlink(path, *a, **kw)
+
+        monkeypatch.setattr(os, "unlink", flaky_unlink)
+        brain._cleanup_old_cache()
+        assert sorted(p.name for p in tmp_path.glob("*.cache")) == ["0.cache", "2.cache"]
+    finally:
+        monkeypatch.undo()
+        _shutdown_brain(brain)
+
+
+def test_parse_dependency_is_memoized(tmp_path: Path) -> None:
+    brain = _make_brain(tmp_path, {"process_pool_size": 0})
+    try:
+        name, spec = brain._parse_dependency("Brain Core>=1.0.0,<2")
+        assert name == "Brain Core"
+        assert "1.5.0" in spec
+        assert brain._parse_dependency("Brain Core>=1.0.0,<2")[1] is spec
+        brain._validate_dependency("Brain Core>=1.0.0,<2")
+    finally:
+        _shutdown_brain(brain)
+
+
+def test_task_prefixes_follow_config_replacement(tmp_path: Path) -> None:
+    brain = _make_brain(tmp_path, {"executor_routing_strategy": "balanced"})
+    try:
+        assert brain._select_executor_kind(task_id="calc_1", priority=0, args=(), kwargs={}) == "thread"
+        brain.config["cpu_task_prefixes"] = ["calc_"]
+        assert brain._select_executor_kind(task_id="calc_1", priority=0, args=(), kwargs={}) == "process"
+    finally:
+        _shutdown_brain(brain)
+
+
+def test_completed_task_stats_track_average(tmp_path: Path) -> None:
+    brain = _make_brain(tmp_path, {"process_pool_size": 0})
+    try:
+        async def run() -> None:
+            for i in range(3):
+                assert await brain.compute(f"io_stat_{i}", pow, i, 2) == i * i
+
+        asyncio.run(run())
+        stats = brain.performance_stats
+        assert stats["completed_tasks"] == 3
+        assert stats["avg_compute_time"] >= 0.0
+        assert abs(stats["avg_compute_time"] * 3 - brain._compute_time_total) < 1e-12
+    finally:
+        _shutdown_brain(brain)
+
+
+def _peak_concurrency(pool: ThreadPoolExecutor, tasks: int) -> int:
+    """提交 tasks 个同时阻塞的任务，返回实际同时运行的最大数量。"""
+    lock = threading.Lock()
+    release = threading.Event()
+    running = 0
+    peak = 0
+
+    def task() -> None:
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        release.wait(5.0)
+        with lock:
+            running -= 1
+
+    futures = [pool.submit(task) for _ in range(tasks)]
+    deadline = time.monotonic() + 2.0
+    while time.monotonic() < deadline:
+        with lock:
+            if running >= tasks:
+                break
+        time.sleep(0.01)
+    release.set()
+    for f in futures:
+        f.result(timeout=5.0)
+    return peak
+
+
+def test_config_update_thread_pool_size_requires_restart(tmp_path: Path, caplog: Any) -> None:
+    brain = _make_brain(tmp_path, {"process_pool_size": 0, "thread_pool_size": 3})
+    try:
+        pool = brain.thread_pool
+        assert _peak_concurrency(pool, 3) == 3
+
+        # 运行中无法真正缩容：保持原并发并提示需重启
+        with caplog.at_level(logging.INFO):
+            brain._on_config_update({"thread_pool_size": 1})
+        assert "thread_pool_size 变更需重启后生效" in caplog.text
+        assert brain.thread_pool is pool
+        assert _peak_concurrency(pool, 3) == 3
+    finally:
+        _shutdown_brain(brain)
+
+
+def test_task_kind_maps_task_ids_to_bounded_metric_labels(tmp_path: Path) -> None:
+    brain = _make_brain(tmp_path, {"process_pool_size": 0})
+    try:
+        assert brain._task_kind("cpu_train_12") == "cpu"
+        assert brain._task_kind("io_train_7") == "io"
+        assert brain._task_kind("train_3") == "other"
+        brain.config["cpu_task_prefixes"] = ["train_"]
+        assert brain._task_kind("train_3") == "cpu"
+    finally:
+        _shutdown_brain(brain)
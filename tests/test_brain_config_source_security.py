@@ -26,3 +26,145 @@ def test_file_config_source_accepts_dict_root(tmp_path: Path) -> None:
 
     src = FileConfigSource(str(config_file))
     assert src.load() == {"log_level": "INFO"}
+
+
+def test_file_config_source_watch_notifies_on_change(tmp_path: Path) -> None:
+    import os
+    import threading
+
+    config_file = tmp_path / "watched.json"
+    config_file.write_text(json.dumps({"v": 1}), encoding="utf-8")
+
+    seen: list[dict] = []
+    changed = threading.Event()
+
+    def listener(cfg: dict) -> None:
+        seen.append(cfg)
+        changed.set()
+
+    src = FileConfigSource(str(config_file), poll_seconds=0.05)
+    src.start_watch(listener)
+    try:
+        config_file.write_text(json.dumps({"v": 2}), encoding="utf-8")
+        st = config_file.stat()
+        os.utime(config_file, ns=(st.st_atime_ns, st.st_mtime_ns + 2_000_000_000))
+        assert changed.wait(5.0)
+        assert seen[-1] == {"v": 2}
+    finally:
+        src.stop_watch()
+
+
+def test_file_config_source_detects_same_mtime_rewrite(tmp_path: Path) -> None:
+    import os
+
+    config_file = tmp_path / "same_mtime.json"
+    config_file.write_text(json.dumps({"v": 1}), encoding="utf-8")
+    st = config_file.stat()
+
+    seen: list[dict] = []
+    src = FileConfigSource(str(config_file))
+    src._check_changed(seen.append)
+    config_file.write_text(json.dumps({"v": 22}), encoding="utf-8")
+    os.utime(config_file, ns=(st.st_atime_ns, st.st_mtime_ns))
+    src._check_changed(seen.append)
+    assert seen == [{"v": 22}]
+
+
+def _fake_consul_source(monkeypatch, responses: list) -> tuple:
+    import sys
+    import types
+
+    calls: list[dict] = []
+
+    class _KV:
+        def get(self, key, **kwargs):
+            calls.append(kwargs)
+            if responses:
+                return responses.pop(0)
+            raise RuntimeError("no more responses")
+
+    class _Consul:
+        def __init__(self, host, port):
+            self.kv = _KV()
+
+    monkeypatch.setitem(sys.modules, "consul", types.SimpleNamespace(Consul=_Consul))
+    from brain_system.config import ConsulConfigSource
+
+    src = ConsulConfigSource(host="localhost", port=8500, key_prefix="brain/", poll_seconds=0.05)
+    return src, calls
+
+
+def test_consul_config_source_watch_reuses_blocking_query_items(monkeypatch) -> None:
+    import threading
+
+    items = [{"Key": "brain/log_level", "Value": b'"DEBUG"'}, {"Key": "brain/x", "Value": None}]
+    src, calls = _fake_consul_source(monkeypatch, [(1, []), (2, items)])
+    assert src.load() == {}
+
+    seen: list[dict] = []
+    changed = threading.Event()
+
+    def listener(cfg: dict) -> None:
+        seen.append(cfg)
+        changed.set()
+
+    src.start_watch(listener)
+    try:
+        assert changed.wait(5.0)
+    finally:
+        src.stop_watch()
+
+    assert seen[0] == {"log_level": "DEBUG"}
+    # load() + 一次阻塞查询；变更时不应再额外请求
+    assert calls[1]["index"] == 1
+    assert all("index" in c for c in calls[1:])
+
+
+def test_file_config_source_rate_limits_repeated_warnings(tmp_path: Path, caplog) -> None:
+    config_file = tmp_path / "broken.json"
+    config_file.write_text("{not json", encoding="utf-8")
+
+    src = FileConfigSource(str(config_file))
+    with caplog.at_level("WARNING"):
+        for _ in range(5):
+            assert src.load() == {}
+        config_file.write_text(json.dumps([1]), encoding="utf-8")
+        assert src.load() == {}
+
+    assert len(caplog.records) == 2
+
+
+def test_network_fs_detection_uses_longest_mount_prefix(tmp_path: Path, monkeypatch) -> None:
+    import sys
+
+    import brain_system.config as config_mod
+
+    mounts = tmp_path / "mounts"
+    mounts.write_text(
+        "/dev/sda1 / ext4 rw 0 0\n"
+        "server:/export /mnt/share nfs4 rw 0 0\n"
+        "server:/sp /mnt/with\\040space cifs rw 0 0\n"
+        "tmpfs /mnt/share/local tmpfs rw 0 0\n",
+        encoding="utf-8",
+    )
+    monkeypatch.setattr(sys, "platform", "linux")
+    monkeypatch.setattr(config_mod, "_PROC_MOUNTS", str(mounts))
+    monkeypatch.setattr(config_mod.os.path, "realpath", lambda p: str(p))
+
+    assert config_mod._is_network_fs(Path("/mnt/share/app/config.json"))
+    assert config_mod._is_network_fs(Path("/mnt/with space/config.json"))
+    assert not config_mod._is_network_fs(Path("/mnt/share/local/config.json"))
+    assert not config_mod._is_network_fs(Path("/mnt/shared/config.json"))
+    assert not config_mod._is_network_fs(Path("/etc/brain.json"))
+
+
+def test_file_config_source_polls_on_network_fs(tmp_path: Path, monkeypatch) -> None:
+    import brain_system.config as config_mod
+
+    config_file = tmp_path / "remote.json"
+    config_file.write_text(json.dumps({"v": 1}), encoding="utf-8")
+    monkeypatch.setattr(config_mod, "_is_network_fs", lambda _p: True)
+
+    src = FileConfigSource(str(config_file), poll_seconds=0.05)
+    assert src._start_event_watch(lambda _cfg: None) is False
+    assert src._observer is None
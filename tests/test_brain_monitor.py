@@ -0,0 +1,54 @@
+import asyncio
+import json
+from pathlib import Path
+from typing import Callable
+
+from brain_system.core import BrainCore
+
+
+class _TickDLC:
+    def __init__(self) -> None:
+        self.ticks = 0
+
+    def on_monitor_tick(self, stats: dict) -> None:
+        self.ticks += 1
+
+
+async def _wait_until(predicate: Callable[[], bool], timeout: float = 5.0) -> bool:
+    """轮询直到 predicate 成立或超时，避免按固定睡眠时长断言。"""
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        if asyncio.get_running_loop().time() >= deadline:
+            return False
+        await asyncio.sleep(0.01)
+    return True
+
+
+def test_request_monitor_tick_wakes_monitor_and_idle_ticks_are_skipped(tmp_path: Path) -> None:
+    config_file = tmp_path / "brain_config.json"
+    config_file.write_text(
+        json.dumps({"enable_disk_cache": False, "process_pool_size": 0, "monitoring_interval": 0.05}),
+        encoding="utf-8",
+    )
+    brain = BrainCore(config_path=str(config_file))
+    dlc = _TickDLC()
+    brain.dlcs["tick"] = dlc  # type: ignore[assignment]
+
+    async def scenario() -> None:
+        brain.start_performance_monitor()
+        # 首个周期总会采样一次（首次采样与 to_thread 钩子在慢机器上可能较久）
+        assert await _wait_until(lambda: dlc.ticks >= 1)
+        first = dlc.ticks
+        assert first == 1
+        # 无新任务：此后若干个监控周期的超时唤醒都被跳过
+        await asyncio.sleep(0.3)
+        assert dlc.ticks == first
+        brain.request_monitor_tick()
+        assert await _wait_until(lambda: dlc.ticks > first)
+        assert dlc.ticks == first + 1
+        brain.monitor_task.cancel()
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        brain.thread_pool.shutdown(wait=True)
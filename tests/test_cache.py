@@ -10,3 +10,241 @@ def test_lru_eviction():
     assert c.get("b") is None
     assert c.get("a") == 1
     assert c.get("c") == 3
+
+
+def test_hit_entries_get_second_chance_on_eviction():
+    c = LruTtlCache(max_entries=3, ttl_seconds=60, dynamic_ttl=False)
+    for k in ("a", "b", "c"):
+        c.set(k, k)
+    c.get("a")
+    c.get("b")
+    c.set("d", "d")
+    # a、b 被命中过，清除标记后轮转到队尾；c 未被访问，被驱逐
+    assert c.get("c") is None
+    c.set("e", "e")
+    # 队列现为 d、a、b（标记均已清除），队首 d 被驱逐
+    assert c.get("d") is None
+    assert len(c) == 3
+
+
+def test_set_existing_key_refreshes_lru_order():
+    c = LruTtlCache(max_entries=2, ttl_seconds=60)
+    c.set("a", 1)
+    c.set("b", 2)
+    c.set("a", 10)
+    c.set("c", 3)
+    assert c.get("b") is None
+    assert c.get("a") == 10
+    assert c.get("c") == 3
+
+
+def test_expired_entry_is_dropped(monkeypatch):
+    import brain_system.cache as cache_mod
+
+    now = [100.0]
+    monkeypatch.setattr(cache_mod, "_now", lambda: now[0])
+    c = LruTtlCache(max_entries=4, ttl_seconds=10, dynamic_ttl=False)
+    c.set("a", 1)
+    now[0] = 109.0
+    assert c.get("a") == 1
+    now[0] = 111.0
+    assert c.get("a") is None
+    assert c.expired == 1
+    assert c.current_bytes == 0
+
+
+def test_purge_handles_mixed_ttls(monkeypatch):
+    import brain_system.cache as cache_mod
+
+    now = [0.0]
+    monkeypatch.setattr(cache_mod, "_now", lambda: now[0])
+    c = LruTtlCache(max_entries=10, ttl_seconds=100, dynamic_ttl=False)
+    c.set("long", 1)
+    c.set("short", 2, ttl=5)
+    now[0] = 10.0
+    c.set("other", 3)
+    assert len(c) == 2
+    assert c.expired == 1
+    assert c.get("long") == 1
+
+
+def test_concurrent_access_keeps_counters_consistent():
+    import threading
+
+    c = LruTtlCache(max_entries=64, ttl_seconds=60)
+    n_threads, n_ops = 8, 500
+
+    def worker(tid: int) -> None:
+        for i in range(n_ops):
+            key = f"k{(tid * n_ops + i) % 100}"
+            c.set(key, i)
+            c.get(key)
+
+    threads = [threading.Thread(target=worker, args=(t,)) for t in range(n_threads)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert c.hits + c.misses == n_threads * n_ops
+    assert len(c) <= 64
+
+
+def test_sharded_cache_roundtrip():
+    from brain_system.cache import ShardedLruTtlCache
+
+    c = ShardedLruTtlCache(max_entries=1000, ttl_seconds=60, shards=5)
+    assert c.shard_count == 8
+    for i in range(50):
+        c.set(f"k{i}", i)
+    assert len(c) == 50
+    assert c.get("k7") == 7
+    assert c.get("missing") is None
+    assert c.hits == 1 and c.misses == 1
+
+    snap = c.snapshot_serializable()
+    other = ShardedLruTtlCache(max_entries=1000, ttl_seconds=60, shards=4)
+    other.load_serializable(snap)
+    assert other.get("k42") == 42
+    assert other.get_stats()["entries"] == 50
+
+
+def test_load_serializable_replaces_existing_keys():
+    c = LruTtlCache(max_entries=3, ttl_seconds=60)
+    c.set("a", "x" * 100)
+    c.set("b", 2)
+    c.load_serializable({"a": 1, "c": 3, "d": 4})
+    assert c.get("b") is None
+    assert c.get("a") == 1
+    assert c.current_bytes < 100
+
+
+def test_snapshot_skips_unserializable_values():
+    c = LruTtlCache(max_entries=10, ttl_seconds=60)
+    c.set("s", "text")
+    c.set("l", [1, "two", None])
+    c.set("nested", {"a": [1, {"b": 2}]})
+    c.set("bad", object())
+    c.set("bad_nested", [object()])
+    snap = c.snapshot_serializable()
+    assert set(snap) == {"s", "l", "nested"}
+
+
+def test_get_many_and_set_many():
+    from brain_system.cache import ShardedLruTtlCache
+
+    for c in (
+        LruTtlCache(max_entries=3, ttl_seconds=60),
+        ShardedLruTtlCache(max_entries=64, ttl_seconds=60, shards=4),
+    ):
+        c.set_many({"a": 1, "b": None, "c": 3})
+        assert c.get_many(["a", "b", "zz"]) == {"a": 1, "b": None}
+        assert c.hits == 2 and c.misses == 1
+
+    small = LruTtlCache(max_entries=3, ttl_seconds=60)
+    small.set_many({"a": 1, "b": 2, "c": 3, "d": 4})
+    assert len(small) == 3
+    assert small.get("a") is None
+    assert small.evictions == 1
+
+
+def test_intern_keys_option():
+    c = LruTtlCache(max_entries=4, ttl_seconds=60, intern_keys=True)
+    key = "".join(["user", ":", "42"])
+    c.set(key, 1)
+    stored = next(iter(c._items))
+    assert stored is __import__("sys").intern("user:42")
+    assert c.get("user:42") == 1
+
+
+def test_dump_json_streams_serializable_entries():
+    import io
+    import json
+
+    from brain_system.cache import ShardedLruTtlCache
+
+    for c in (
+        LruTtlCache(max_entries=10, ttl_seconds=60),
+        ShardedLruTtlCache(max_entries=64, ttl_seconds=60, shards=4),
+    ):
+        c.set("s", "文本")
+        c.set("n", {"a": [1, 2]})
+        c.set("bad", object())
+        buf = io.BytesIO()
+        assert c.dump_json(buf) == 2
+        assert json.loads(buf.getvalue()) == {"s": "文本", "n": {"a": [1, 2]}}
+
+
+def test_dump_json_round_trips_nan_inf_and_big_ints():
+    import io
+    import json
+    import math
+
+    c = LruTtlCache(max_entries=10, ttl_seconds=60)
+    c.set("a", [1.0, math.nan])
+    c.set("b", 2**70)
+    c.set("c", {"x": math.inf})
+    buf = io.BytesIO()
+    assert c.dump_json(buf) == 3
+
+    restored = LruTtlCache(max_entries=10, ttl_seconds=60)
+    restored.load_serializable(json.loads(buf.getvalue()))
+    assert math.isnan(restored.get("a")[1])
+    assert restored.get("b") == 2**70
+    assert restored.get("c") == {"x": math.inf}
+
+
+def test_dump_json_skips_the_same_values_as_snapshot_serializable():
+    import io
+    import json
+    from dataclasses import dataclass
+    from datetime import datetime
+    from enum import Enum
+    from uuid import UUID
+
+    from brain_system.cache import ShardedLruTtlCache
+
+    @dataclass
+    class R:
+        a: int
+
+    class E(Enum):
+        X = 1
+
+    for cache in (
+        LruTtlCache(max_entries=10, ttl_seconds=60),
+        ShardedLruTtlCache(max_entries=10, ttl_seconds=60, shards=2),
+    ):
+        cache.set("dc", R(a=1))
+        cache.set("dt", datetime(2024, 1, 1))
+        cache.set("u", UUID(int=5))
+        cache.set("e", E.X)
+        cache.set("nested", {"when": [datetime(2024, 1, 1)]})
+        cache.set("plain", {"a": [1, 2]})
+        buf = io.BytesIO()
+        assert cache.dump_json(buf) == 1
+        dumped = json.loads(buf.getvalue())
+        assert dumped.keys() == cache.snapshot_serializable().keys() == {"plain"}
+        assert dumped["plain"] == {"a": [1, 2]}
+
+
+def test_dump_json_limit_keeps_hottest_entries():
+    import io
+    import json
+
+    from brain_system.cache import ShardedLruTtlCache
+
+    for cache in (
+        LruTtlCache(max_entries=100, ttl_seconds=60),
+        ShardedLruTtlCache(max_entries=100, ttl_seconds=60, shards=4),
+    ):
+        for i in range(10):
+            cache.set(f"k{i}", i)
+        for _ in range(3):
+            cache.get("k7")
+        cache.get("k2")
+
+        buf = io.BytesIO()
+        assert cache.dump_json(buf, limit=2) == 2
+        assert set(json.loads(buf.getvalue())) == {"k7", "k2"}
+        assert set(cache.snapshot_serializable(limit=2)) == {"k7", "k2"}
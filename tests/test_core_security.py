@@ -17,3 +17,117 @@ def test_signature_required_rejects_without_public_keys(tmp_path: Path):
 
     loaded = brain.load_dlc_file(str(dlc_file))
     assert loaded == 0
+
+
+def test_load_all_dlcs_loads_files_in_parallel_and_skips_unsigned(tmp_path: Path):
+    dlcs = tmp_path / "dlcs"
+    dlcs.mkdir()
+    template = (
+        "from brain_system.dlc import BrainDLC\n"
+        "from brain_system.models import BrainDLCType, DLCManifest\n"
+        "class {cls}(BrainDLC):\n"
+        "    def get_manifest(self):\n"
+        "        return DLCManifest(name='{name}', version='1.0.0', author='t', description='',\n"
+        "                           dlc_type=BrainDLCType.PROCESSOR)\n"
+    )
+    for i in range(4):
+        (dlcs / f"par_dlc_{i}.py").write_text(template.format(cls=f"ParDLC{i}", name=f"par_{i}"), encoding="utf-8")
+    # 带 .sig 但未配置公钥 => 验签失败，该文件被跳过
+    (dlcs / "par_dlc_4.py").write_text(template.format(cls="ParDLC4", name="par_4"), encoding="utf-8")
+    (dlcs / "par_dlc_4.py.sig").write_bytes(b"bogus")
+
+    brain = BrainCore(config_path=None)
+    try:
+        loaded = brain.load_all_dlcs([str(dlcs)])
+        assert loaded == 4
+        assert sorted(brain.dlcs) == ["par_0", "par_1", "par_2", "par_3"]
+    finally:
+        brain.thread_pool.shutdown(wait=True)
+        if brain.process_pool:
+            brain.process_pool.shutdown(wait=True)
+
+
+def test_sha256_file_matches_hashlib_for_small_and_large_files(tmp_path: Path):
+    import hashlib
+
+    from brain_system.security.signatures import _SHA256_READ_ALL_MAX_BYTES, _sha256_file
+
+    for size in (0, 1000, _SHA256_READ_ALL_MAX_BYTES + 12345):
+        f = tmp_path / f"f{size}.bin"
+        data = bytes(range(256)) * (size // 256) + b"x" * (size % 256)
+        f.write_bytes(data)
+        assert _sha256_file(f) == hashlib.sha256(data).digest()
+
+
+def test_load_all_dlcs_registers_in_dependency_order_and_skips_cycles(tmp_path: Path):
+    dlcs = tmp_path / "dlcs"
+    dlcs.mkdir()
+    template = (
+        "from brain_system.dlc import BrainDLC\n"
+        "from brain_system.models import BrainDLCType, DLCManifest\n"
+        "class {cls}(BrainDLC):\n"
+        "    def get_manifest(self):\n"
+        "        return DLCManifest(name='{name}', version='1.0.0', author='t', description='',\n"
+        "                           dlc_type=BrainDLCType.PROCESSOR, dependencies={deps!r},\n"
+        "                           priority={prio})\n"
+    )
+    specs = [
+        ("TopoA", "topo_a", ["topo_b>=1.0"], 0),  # 优先级更高，但依赖 b
+        ("TopoB", "topo_b", ["Brain Core"], 5),
+        ("TopoC", "topo_c", ["topo_d"], 0),
+        ("TopoD", "topo_d", ["topo_c"], 0),
+    ]
+    for cls, name, deps, prio in specs:
+        (dlcs / f"{name}.py").write_text(template.format(cls=cls, name=name, deps=deps, prio=prio), encoding="utf-8")
+
+    brain = BrainCore(config_path=None)
+    try:
+        loaded = brain.load_all_dlcs([str(dlcs)])
+        assert loaded == 2
+        assert list(brain.dlcs) == ["topo_b", "topo_a"]
+    finally:
+        brain.thread_pool.shutdown(wait=True)
+        if brain.process_pool:
+            brain.process_pool.shutdown(wait=True)
+
+
+def test_safe_serializer_roundtrip_and_tamper_detection():
+    import math
+
+    import pytest
+
+    from brain_system.security import SafeSerializer, UnsafeDeserializationError
+
+    payload = {"name": "脑", "items": [1, 2.5, None, True], "big": 2**70, "nan": float("nan")}
+    blob = SafeSerializer.serialize(payload)
+    out = SafeSerializer.deserialize(blob)
+    assert out["name"] == "脑"
+    assert out["items"] == [1, 2.5, None, True]
+    # 标准库可表示而 orjson 不接受的值需回退解析
+    assert out["big"] == 2**70
+    assert math.isnan(out["nan"])
+
+    assert SafeSerializer.deserialize(SafeSerializer.serialize({"a": 1})) == {"a": 1}
+
+    with pytest.raises(UnsafeDeserializationError):
+        SafeSerializer.deserialize(blob.replace("脑".encode(), b"x"))
+
+
+def test_safe_serializer_roundtrips_numpy_arrays():
+    import pytest
+
+    np = pytest.importorskip("numpy")
+    from brain_system.security import SafeSerializer
+
+    arrays = {
+        "f": np.linspace(0.0, 1.0, 12).reshape(3, 4).T,  # 非连续视图
+        "i": np.arange(5, dtype=">i4"),
+        "scalar": np.array(3.5),
+        "obj": np.array(["a", None], dtype=object),
+    }
+    out = SafeSerializer.deserialize(SafeSerializer.serialize(arrays))
+    for key, arr in arrays.items():
+        assert out[key].dtype == arr.dtype
+        assert out[key].shape == arr.shape
+        assert out[key].tolist() == arr.tolist()
+    out["f"][0, 0] = 9.0  # 结果可写
@@ -0,0 +1,67 @@
+import sys
+import threading
+import time
+import types
+
+from brain_system.ha import LeaderElectionConfig, LeaderElector
+
+
+class _FakeLock:
+    def __init__(self) -> None:
+        self.extends = 0
+        self.released = False
+        self.extended = threading.Event()
+
+    def acquire(self, blocking: bool = True) -> bool:
+        return True
+
+    def extend(self, ttl: int) -> None:
+        self.extends += 1
+        self.extended.set()
+
+    def release(self) -> None:
+        self.released = True
+
+
+class _FakeRedis:
+    def __init__(self, **kwargs) -> None:
+        self.pings = 0
+        self.lock_obj = _FakeLock()
+
+    def ping(self) -> bool:
+        self.pings += 1
+        return True
+
+    def lock(self, key: str, timeout: int) -> _FakeLock:
+        return self.lock_obj
+
+
+def _fake_redis_module() -> types.ModuleType:
+    mod = types.ModuleType("redis")
+    mod.Redis = _FakeRedis
+    mod.ConnectionError = type("ConnectionError", (Exception,), {})
+    mod.AuthenticationError = type("AuthenticationError", (Exception,), {})
+    return mod
+
+
+def test_leader_elector_renews_without_ping_and_stops_promptly(monkeypatch):
+    monkeypatch.setitem(sys.modules, "redis", _fake_redis_module())
+    elector = LeaderElector(
+        LeaderElectionConfig(enabled=True, ssl_cert_reqs="none", renew_interval_seconds=0.01)
+    )
+    lock = elector._redis.lock_obj
+    pings_after_connect = elector._redis.pings
+
+    elector.start()
+    assert lock.extended.wait(5.0)
+    assert elector.is_leader
+    assert elector._redis.pings == pings_after_connect
+
+    elector.cfg.renew_interval_seconds = 60.0
+    time.sleep(0.05)
+    t0 = time.perf_counter()
+    elector.stop()
+    assert time.perf_counter() - t0 < 1.0
+    assert not elector._thread.is_alive()
+    assert lock.released
+    assert not elector.is_leader
@@ -0,0 +1,62 @@
+import json
+import math
+from dataclasses import dataclass
+from datetime import date, datetime
+from enum import Enum, IntEnum
+from uuid import UUID
+
+import pytest
+
+from brain_system.utils import json_codec
+
+
+@dataclass
+class _Point:
+    x: int
+
+
+class _Color(Enum):
+    RED = 1
+
+
+class _Level(IntEnum):
+    HIGH = 2
+
+
+def test_loads_accepts_stdlib_only_values():
+    data = json_codec.loads(b'{"a": NaN, "b": Infinity, "c": 1180591620717411303424}')
+    assert math.isnan(data["a"])
+    assert data["b"] == math.inf
+    assert data["c"] == 2**70
+    assert json_codec.loads('{"x": [1, 2]}') == {"x": [1, 2]}
+
+
+def test_dumps_round_trips_values_orjson_would_change():
+    value = {"a": [1.0, math.nan], "b": 2**70, "c": {"x": math.inf}, "d": None, 1: "int key"}
+    decoded = json_codec.loads(json_codec.dumps(value))
+    assert math.isnan(decoded["a"][1])
+    assert decoded["b"] == 2**70
+    assert decoded["c"]["x"] == math.inf
+    assert decoded["d"] is None
+    assert decoded["1"] == "int key"
+    assert json_codec.dumps({"k": "中文"}) == json.dumps({"k": "中文"}, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+@pytest.mark.parametrize(
+    "value",
+    [_Point(1), datetime(2024, 1, 1), date(2024, 1, 1), UUID(int=5), _Color.RED, {"k": [_Color.RED]}],
+)
+def test_dumps_rejects_types_stdlib_rejects(value):
+    with pytest.raises(TypeError):
+        json.dumps(value)
+    with pytest.raises(TypeError):
+        json_codec.dumps(value)
+
+
+def test_dumps_matches_stdlib_for_subclasses_and_cycles():
+    value = {"level": _Level.HIGH, "nested": [{"k": _Level.HIGH}]}
+    assert json_codec.dumps(value) == json.dumps(value, separators=(",", ":")).encode()
+    cyclic: list = []
+    cyclic.append(cyclic)
+    with pytest.raises(ValueError):
+        json_codec.dumps(cyclic)
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import threading
+from typing import Any
+
+from brain_system.observability import COUNTER_FLUSH_BATCH, Observability
+
+
+class _FakeMetric:
+    def __init__(self) -> None:
+        self.value = 0.0
+        self.labels_calls = 0
+        self.children: dict[str, _FakeMetric] = {}
+
+    def labels(self, **kw: Any) -> "_FakeMetric":
+        self.labels_calls += 1
+        return self.children.setdefault(kw["task_kind"], _FakeMetric())
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def observe(self, amount: float) -> None:
+        self.value += amount
+
+
+def _obs() -> Observability:
+    return Observability(
+        enabled=True,
+        metrics_enabled=True,
+        tracing_enabled=False,
+        task_seconds=_FakeMetric(),
+        task_errors=_FakeMetric(),
+        cache_hits=_FakeMetric(),
+        cache_misses=_FakeMetric(),
+    )
+
+
+def test_labeled_children_are_cached_per_task_kind() -> None:
+    obs = _obs()
+    for _ in range(5):
+        obs.observe_task_seconds("cpu", 0.5)
+        obs.inc_task_errors("cpu")
+    obs.observe_task_seconds("io", 1.0)
+
+    assert obs.task_seconds.labels_calls == 2
+    assert obs.task_seconds.children["cpu"].value == 2.5
+    assert obs.task_errors.labels_calls == 1
+    assert obs.task_errors.children["cpu"].value == 5
+
+
+def test_cache_counters_flush_in_batches() -> None:
+    obs = _obs()
+    for _ in range(COUNTER_FLUSH_BATCH - 1):
+        obs.record_cache_hit()
+    obs.record_cache_miss()
+    assert obs.cache_hits.value == 0
+
+    obs.record_cache_hit()
+    assert obs.cache_hits.value == COUNTER_FLUSH_BATCH
+
+    obs.flush_counters()
+    assert obs.cache_misses.value == 1
+    obs.flush_counters()
+    assert obs.cache_hits.value == COUNTER_FLUSH_BATCH
+    assert obs.cache_misses.value == 1
+
+
+def test_flush_counters_waits_for_pending_update() -> None:
+    obs = _obs()
+    obs.record_cache_hit()
+    # 模拟某个线程正处于累加过程中：flush（如 /metrics 线程）必须等它结束再读取清零
+    obs._counter_lock.acquire()
+    flusher = threading.Thread(target=obs.flush_counters)
+    try:
+        flusher.start()
+        flusher.join(0.2)
+        assert flusher.is_alive()
+        obs._pending_cache_hits += 1
+    finally:
+        obs._counter_lock.release()
+    flusher.join()
+
+    assert obs.cache_hits.value == 2
+    assert obs._pending_cache_hits == 0
+
+
+def test_start_span_reuses_null_span_when_tracing_disabled() -> None:
+    from brain_system.observability import start_span
+
+    obs = Observability(enabled=False, metrics_enabled=False, tracing_enabled=False)
+    span = start_span(obs, "a")
+    assert span is start_span(obs, "b")
+    with span as entered:
+        assert entered is span
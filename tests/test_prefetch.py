@@ -0,0 +1,69 @@
+import threading
+
+import pytest
+
+from brain_system.utils.prefetch import Prefetcher
+
+
+def test_prefetcher_preserves_order_and_none_items():
+    items = [1, None, (2, 3), None]
+    assert list(Prefetcher(items, depth=2)) == items
+    # 可重复迭代：每次迭代重新启动生产者
+    assert list(Prefetcher(range(5))) == [0, 1, 2, 3, 4]
+
+
+def test_prefetcher_reraises_producer_exception():
+    def gen():
+        yield 1
+        raise ValueError("bad batch")
+
+    it = iter(Prefetcher(gen()))
+    assert next(it) == 1
+    with pytest.raises(ValueError, match="bad batch"):
+        next(it)
+
+
+def test_prefetcher_stops_producer_on_early_exit():
+    produced = []
+    done = threading.Event()
+
+    def gen():
+        try:
+            for i in range(1000):
+                produced.append(i)
+                yield i
+        finally:
+            done.set()
+
+    for item in Prefetcher(gen(), depth=1):
+        if item == 2:
+            break
+
+    assert done.wait(2.0)
+    assert len(produced) < 10
+
+
+def test_prefetcher_overlaps_loading_with_consumer():
+    n = 6
+    events = []
+    lock = threading.Lock()
+    loading = [threading.Event() for _ in range(n)]
+
+    def record(event):
+        with lock:
+            events.append(event)
+
+    def loader():
+        for i in range(n):
+            record(("load", i))
+            loading[i].set()
+            yield i
+
+    for item in Prefetcher(loader(), depth=2):
+        if item + 1 < n:
+            # 消费者仍持有 item 时，下一项的加载必须已经在后台开始；串行执行会在此超时
+            assert loading[item + 1].wait(2.0)
+        record(("release", item))
+
+    for i in range(n - 1):
+        assert events.index(("load", i + 1)) < events.index(("release", i))
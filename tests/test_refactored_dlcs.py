@@ -44,6 +44,83 @@ def test_distributed_dlc(mock_brain):
     assert dist_dlc.manifest.name == "Distributed Computing"
 
 
+def test_distributed_parallel_map_collects_in_order(mock_brain):
+    """结果按输入顺序返回，异常项保留为 None。"""
+    dist_dlc = DistributedComputingDLC(mock_brain)
+    dist_dlc.initialize()
+
+    def square(x):
+        if x == 3:
+            raise ValueError("boom")
+        return x * x
+
+    try:
+        results = dist_dlc.parallel_map(square, list(range(50)))
+    finally:
+        dist_dlc.stop_workers()
+
+    assert results == [None if x == 3 else x * x for x in range(50)]
+
+
+def test_distributed_parallel_map_process_executor(mock_brain):
+    """process 执行器按块分发可 pickle 的函数。"""
+    dist_dlc = DistributedComputingDLC(mock_brain)
+    dist_dlc.initialize()
+    dist_dlc.start_workers(2)
+
+    try:
+        results = dist_dlc.parallel_map(abs, [-3, 2, -1, 0], executor="process")
+    finally:
+        dist_dlc.stop_workers()
+
+    assert results == [3, 2, 1, 0]
+
+
+def test_distributed_parallel_map_timeout_returns_partial(mock_brain):
+    """默认 30 秒超时；超时后返回已完成的部分结果，None 需显式传入才不限时。"""
+    import inspect
+    import threading
+
+    default = inspect.signature(DistributedComputingDLC.parallel_map).parameters["timeout"].default
+    assert default == 30.0
+
+    dist_dlc = DistributedComputingDLC(mock_brain)
+    dist_dlc.initialize()
+    dist_dlc.start_workers(2)
+    release = threading.Event()
+
+    def slow_on_one(x):
+        if x == 1:
+            release.wait(5)
+        return x
+
+    try:
+        results = dist_dlc.parallel_map(slow_on_one, [0, 1], timeout=0.2)
+    finally:
+        release.set()
+        dist_dlc.stop_workers()
+
+    assert results == [0, None]
+
+
+def test_distributed_partition_data_views(mock_brain):
+    """bytes 按 memoryview 切分不复制；空数据返回空列表，分区数非正时报错。"""
+    dist_dlc = DistributedComputingDLC(mock_brain)
+    dist_dlc.initialize()
+
+    buf = bytearray(b"abcdefg")
+    parts = dist_dlc.partition_data(buf, 3)
+    assert [bytes(p) for p in parts] == [b"abc", b"def", b"g"]
+    buf[0] = ord("z")
+    assert bytes(parts[0]) == b"zbc"
+
+    assert dist_dlc.partition_data([1, 2, 3, 4, 5], 2) == [[1, 2, 3], [4, 5]]
+    assert dist_dlc.partition_data([], 4) == []
+    for bad in (0, -2):
+        with pytest.raises(ValueError):
+            dist_dlc.partition_data([1, 2, 3], bad)
+
+
 def test_hardware_dlc(mock_brain):
     """硬件加速DLC测试（需要numpy）。"""
     pytest.importorskip("numpy", reason="numpy not installed")
@@ -105,3 +182,68 @@ def test_workflow_dlc(mock_brain):
     wf_dlc.initialize()
     
     assert wf_dlc.manifest.name == "Neural Workflow Manager"
+
+
+def test_workflow_sgd_step_updates_in_place():
+    """SGD 更新：numpy 参数原地更新且不改写 grad，标量参数走回退路径。"""
+    np = pytest.importorskip("numpy", reason="numpy not installed")
+    from types import SimpleNamespace
+    from dlcs.brain_dlc_workflow import NeuralWorkflowDLC
+
+    data = np.ones(4, dtype=np.float32)
+    grad = np.full(4, 2.0)
+    arr_param = SimpleNamespace(data=data, grad=grad)
+    scalar_param = SimpleNamespace(data=1.0, grad=2.0)
+    scratch = {}
+
+    for _ in range(2):
+        NeuralWorkflowDLC._sgd_step([arr_param, scalar_param], 0.25, scratch)
+
+    assert arr_param.data is data
+    assert np.allclose(data, 0.0)
+    assert np.allclose(grad, 2.0)
+    assert scalar_param.data == 0.0
+    assert len(scratch) == 1
+
+
+def test_workflow_train_loop_pure_python(mock_brain):
+    """train_loop 不依赖 numpy：标量参数经 compute_loss/backward 正常收敛。"""
+    from types import SimpleNamespace
+    from dlcs.brain_dlc_workflow import NeuralWorkflowDLC
+
+    class Loss:
+        def __init__(self, model, x, y):
+            self.model, self.x, self.y = model, x, y
+            self.data = (model.w.data * x - y) ** 2
+
+        def backward(self):
+            self.model.w.grad = 2 * (self.model.w.data * self.x - self.y) * self.x
+
+    class Model:
+        def __init__(self):
+            self.w = SimpleNamespace(data=0.0, grad=None)
+
+        def parameters(self):
+            return [self.w]
+
+        def zero_grad(self):
+            self.w.grad = None
+
+        def __call__(self, x):
+            return x
+
+        def compute_loss(self, pred, y):
+            return Loss(self, pred, y)
+
+    wf_dlc = NeuralWorkflowDLC(mock_brain)
+    wf_dlc.initialize()
+    model = Model()
+    out = wf_dlc.train_loop(model, [(1.0, 3.0), (2.0, 6.0)], epochs=20, lr=0.05)
+
+    assert out["status"] == "completed"
+    assert abs(model.w.data - 3.0) < 1e-3
+    assert out["history"]["loss"][-1] < out["history"]["loss"][0]
+
+    prefetched = Model()
+    out = wf_dlc.train_loop(prefetched, [(1.0, 3.0), (2.0, 6.0)], epochs=20, lr=0.05, prefetch=2)
+    assert prefetched.w.data == model.w.data
@@ -38,6 +38,57 @@ class TestConfigService(unittest.TestCase):
         self.assertEqual(new_service.get_scroll_sensitivity(), 5)
         self.assertEqual(new_service.get_highlight_size_limit(), 100)
 
+class TestAppConfigReload(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.config_path = os.path.join(self.test_dir, "app_config.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_reload_only_when_mtime_changes_and_updates_in_place(self):
+        cfg = AppConfig(scroll_sensitivity=3)
+        cfg.save(self.config_path)
+        st = os.stat(self.config_path)
+
+        with patch("config.app_config.open", side_effect=AssertionError("unexpected read")):
+            self.assertIs(cfg.reload_if_changed(self.config_path), cfg)
+
+        with open(self.config_path, "w", encoding="utf-8") as f:
+            f.write('{"scroll_sensitivity": 9}')
+        # 时间戳回拨同样视为变化
+        os.utime(self.config_path, ns=(st.st_atime_ns, st.st_mtime_ns - 10**9))
+        self.assertIs(cfg.reload_if_changed(self.config_path), cfg)
+        self.assertEqual(cfg.scroll_sensitivity, 9)
+
+    def test_save_skips_unchanged_payload_and_replaces_atomically(self):
+        cfg = AppConfig(theme="dark")
+        cfg.save(self.config_path)
+
+        with patch("config.app_config.open", side_effect=AssertionError("unexpected write")):
+            cfg.save(self.config_path)
+
+        cfg.theme = "light"
+        cfg.save(self.config_path)
+        self.assertEqual(AppConfig.load(self.config_path).theme, "light")
+        self.assertEqual(os.listdir(self.test_dir), ["app_config.json"])
+
+        # 文件被外部改写后，即使内容未变也要重新写回
+        with open(self.config_path, "w", encoding="utf-8") as f:
+            f.write("{}")
+        os.utime(self.config_path, ns=(0, 10**9))
+        cfg.save(self.config_path)
+        self.assertEqual(AppConfig.load(self.config_path).theme, "light")
+
+    def test_validate_resets_invalid_values(self):
+        cfg = AppConfig(scroll_sensitivity="x", highlight_size_limit="7", max_history_items=-1, theme="")
+        cfg._validate()
+        self.assertEqual(cfg.scroll_sensitivity, AppConfig().scroll_sensitivity)
+        self.assertEqual(cfg.highlight_size_limit, 7)
+        self.assertEqual(cfg.max_history_items, 100)
+        self.assertEqual(cfg.theme, "light")
+
+
 class TestSystemService(unittest.TestCase):
     def setUp(self):
         self.service = SystemService()
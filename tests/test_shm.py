@@ -0,0 +1,31 @@
+import pytest
+
+from brain_system.shm import export_shared_arrays, invoke_with_shared_arrays, release_shared_arrays
+
+
+def test_export_passes_through_non_array_args():
+    args, kwargs, segments = export_shared_arrays((1, "x", [1, 2]), {"k": b"v"}, min_bytes=1)
+    assert args == (1, "x", [1, 2])
+    assert kwargs == {"k": b"v"}
+    assert segments == []
+
+
+def test_large_arrays_roundtrip_through_shared_memory():
+    np = pytest.importorskip("numpy")
+
+    big = np.arange(100_000, dtype=np.float64)
+    small = np.arange(4)
+    args, kwargs, segments = export_shared_arrays((big,), {"scale": 2.0, "small": small}, min_bytes=1024)
+    try:
+        assert len(segments) == 1
+        assert kwargs["small"] is small
+
+        def total(arr, scale, small):
+            return float(arr.sum() * scale + small.sum())
+
+        assert invoke_with_shared_arrays(total, args, kwargs) == float(big.sum() * 2.0 + small.sum())
+        # 返回共享内存上的视图时会被复制，段关闭后仍可使用
+        view = invoke_with_shared_arrays(lambda arr, **_: arr[:10], args, kwargs)
+        assert view.tolist() == big[:10].tolist()
+    finally:
+        release_shared_arrays(segments)
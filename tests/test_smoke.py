@@ -29,5 +29,35 @@ class TestSmoke(unittest.TestCase):
         learner = CrashPatternLearner(os.path.join(os.path.dirname(__file__), "dummy_data"))
         self.assertIsNotNone(learner)
 
+    def test_utils_lazy_optional_attributes(self):
+        """Lazy optional modules resolve on first access and are cached on the module."""
+        import brain_system.utils as utils
+        utils.__dict__.pop("psutil", None)
+        self.assertIs(utils.psutil, sys.modules.get("psutil"))
+        self.assertIn("psutil", vars(utils))
+        with self.assertRaises(AttributeError):
+            utils.not_a_lazy_module
+
+    def test_utils_numpy_if_loaded_does_not_import(self):
+        """numpy_if_loaded only reports an already-imported numpy."""
+        from unittest import mock
+        from brain_system.utils import numpy_if_loaded
+        with mock.patch.dict(sys.modules):
+            sys.modules.pop("numpy", None)
+            self.assertIsNone(numpy_if_loaded())
+            self.assertNotIn("numpy", sys.modules)
+            sentinel = object()
+            sys.modules["numpy"] = sentinel
+            self.assertIs(numpy_if_loaded(), sentinel)
+
+    def test_utils_tensor_shape(self):
+        """Tensor derives shape from sequences, shaped objects and scalars."""
+        from brain_system.utils import CPUDevice, Tensor
+        device = CPUDevice()
+        self.assertEqual(Tensor([1, 2, 3], device).shape, (3,))
+        self.assertEqual(Tensor(memoryview(b"ab"), device).shape, (2,))
+        self.assertEqual(Tensor(1.5, device).shape, ())
+        self.assertFalse(hasattr(Tensor((), device), "__dict__"))
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,74 @@
+import random
+import statistics
+
+from brain_system.training import LatencyHistogram
+
+
+def test_latency_histogram_quantiles_track_exact_values():
+    rng = random.Random(42)
+    samples = [rng.lognormvariate(1.0, 1.0) for _ in range(5000)]
+    hist = LatencyHistogram()
+    for v in samples:
+        hist.observe(v)
+
+    exact = statistics.quantiles(samples, n=100)
+    assert hist.n == len(samples)
+    # 桶宽约 26%，桶内插值后误差应远小于桶宽
+    assert abs(hist.quantile(0.5) - exact[49]) / exact[49] < 0.05
+    assert abs(hist.quantile(0.95) - exact[94]) / exact[94] < 0.05
+    assert hist.min <= hist.quantile(0.0) and hist.quantile(1.0) <= hist.max
+
+
+def test_latency_histogram_edge_cases():
+    hist = LatencyHistogram()
+    assert hist.quantile(0.5) == 0.0
+
+    hist.observe(7.0)
+    assert hist.quantile(0.5) == 7.0
+    hist.observe(10_000_000.0)  # 超出最大桶上界
+    assert hist.counts[-1] == 1
+    assert hist.quantile(1.0) == 10_000_000.0
+
+
+def test_train_runs_jobs_through_worker_pool():
+    import asyncio
+
+    from brain_system.training import BrainTrainer, TrainingConfig
+
+    class _Brain:
+        config: dict = {}
+
+        def __init__(self):
+            self.active = 0
+            self.peak = 0
+
+        async def compute(self, task_id, func, *args):
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            try:
+                await asyncio.sleep(0)
+                if task_id.startswith("train_"):
+                    raise RuntimeError("boom")
+                return None
+            finally:
+                self.active -= 1
+
+    brain = _Brain()
+    cfg = TrainingConfig(duration_seconds=0.2, concurrency=4, include_io=False, include_cache_warmup=False)
+    report = asyncio.run(BrainTrainer().train(brain, cfg=cfg))
+
+    assert report.total_tasks > 0
+    assert report.successes + report.failures == report.total_tasks
+    assert report.failures > 0
+    assert brain.peak <= cfg.concurrency
+
+
+def test_recommend_config_uses_reported_p95():
+    from brain_system.training import BrainTrainer, TrainingConfig
+
+    class _Brain:
+        config = {"retry_max_attempts": 2}
+
+    trainer = BrainTrainer()
+    assert trainer.recommend_config(_Brain(), cfg=TrainingConfig(), p95_ms=2000.0)["retry_max_attempts"] == 3
+    assert "retry_max_attempts" not in trainer.recommend_config(_Brain(), cfg=TrainingConfig(), p95_ms=10.0)